@@ -1,8 +1,10 @@
 from django.contrib import admin
 
-from .models import Category, Location, Post
+from .models import Category, Follow, Job, Location, Post
 
 
 admin.site.register(Category)
 admin.site.register(Location)
 admin.site.register(Post)
+admin.site.register(Job)
+admin.site.register(Follow)
@@ -0,0 +1,162 @@
+"""
+Asynchronous versions of the read-only feed and detail views.
+
+Django's ORM is synchronous, so every database round trip runs in a worker
+thread. Lookups that don't depend on each other (the author and the page
+of posts, the post and its comments) are started together.
+"""
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.db import close_old_connections
+from django.http import Http404
+from django.shortcuts import get_object_or_404, render
+
+from . import catalog
+from .cache import (cache_page, get_cached_page, is_page_cacheable,
+                    page_cache_key)
+from .forms import CommentForm
+from .metrics import record_queries
+from .models import Post, User
+from .paginators import CachedCountPaginator, CursorPaginator
+from .profiling import sample_thread
+from .views import (check_post_visibility, filtering, get_comments_page,
+                    get_follow_context)
+
+
+def _call(func, args, kwargs):
+    # Connections are per thread, so request metrics and the profiler are
+    # attached to every worker thread a view hands its queries to.
+    with record_queries(), sample_thread():
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+
+def run(func, *args, **kwargs):
+    """Runs blocking code in its own thread so calls can overlap."""
+    return sync_to_async(_call, thread_sensitive=False)(func, args, kwargs)
+
+
+def paginate(request, queryset, count_key=None):
+    """Returns the pagination part of a list view context."""
+    context = {}
+    if settings.POST_CURSOR_PAGINATION:
+        paginator = CursorPaginator(queryset, settings.POST_PAGINATION)
+        page = paginator.page(request.GET.get('cursor'))
+    else:
+        paginator = CachedCountPaginator(
+            queryset, settings.POST_PAGINATION, count_key=count_key
+        )
+        try:
+            page = paginator.page(request.GET.get('page') or 1)
+        except InvalidPage:
+            raise Http404('Неверный номер страницы.')
+        page.object_list = list(page.object_list)
+        context['page_range'] = list(paginator.get_page_range(page.number))
+    context.update({
+        'paginator': paginator,
+        'page_obj': page,
+        'is_paginated': page.has_other_pages(),
+        'object_list': page.object_list,
+        'cursor_pagination': settings.POST_CURSOR_PAGINATION,
+    })
+    return context
+
+
+def paginate_feed(request, posts, count_key):
+    """Applies ``filtering()``, which reads the catalog, and paginates."""
+    return paginate(request, filtering(posts), count_key)
+
+
+def is_profile_owner(request, username):
+    return request.user.username == username
+
+
+def anonymous_page_cache(view):
+    """Async counterpart of ``AnonymousPageCacheMixin``."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if not await run(is_page_cacheable, request):
+            return await view(request, *args, **kwargs)
+        key = await run(page_cache_key, request.get_full_path())
+        response = await run(get_cached_page, request, key)
+        if response is None:
+            response = await run(
+                cache_page, request, await view(request, *args, **kwargs), key
+            )
+        return response
+    return wrapper
+
+
+@anonymous_page_cache
+async def post_list(request):
+    context = await run(paginate_feed, request, Post.objects, 'feed')
+    return await run(render, request, 'blog/index.html', context)
+
+
+@anonymous_page_cache
+async def category_posts(request, category_slug):
+    category = await run(catalog.get_published_category, category_slug)
+    if category is None:
+        raise Http404('Категория не найдена.')
+    context = await run(
+        paginate_feed, request, Post.objects.filter(category=category),
+        f'category:{category.pk}'
+    )
+    context['category'] = category
+    return await run(render, request, 'blog/category.html', context)
+
+
+async def profile(request, username):
+    posts = Post.objects.filter(author__username=username)
+    if await run(is_profile_owner, request, username):
+        page = run(
+            paginate, request,
+            posts.select_related('author').with_catalog().order_by(
+                '-pub_date'
+            ),
+            f'username:{username}:all'
+        )
+    else:
+        page = run(paginate_feed, request, posts, f'username:{username}')
+    author, context = await asyncio.gather(
+        run(get_object_or_404, User, username=username), page
+    )
+    context['profile'] = author
+    context.update(await run(get_follow_context, request.user, author))
+    return await run(render, request, 'blog/profile.html', context)
+
+
+def get_visible_post(request, post_id):
+    post = get_object_or_404(
+        Post.objects.select_related('category', 'location', 'author'),
+        pk=post_id
+    )
+    check_post_visibility(post, request.user)
+    return post
+
+
+async def post_detail(request, post_id):
+    # Комментарии загружаются параллельно с постом, но если пост не найден
+    # или скрыт, их задача отменяется и страница комментариев не строится.
+    comments = asyncio.ensure_future(
+        run(get_comments_page, request, post_id)
+    )
+    try:
+        post = await run(get_visible_post, request, post_id)
+    except BaseException:
+        comments.cancel()
+        raise
+    comments = await comments
+    context = {
+        'object': post,
+        'post': post,
+        'form': CommentForm(),
+        'comments': comments,
+    }
+    return await run(render, request, 'blog/detail.html', context)
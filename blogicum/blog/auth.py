@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .cache import get_versions
+
+USER_KEY = 'blog:user:{pk}:{version}'
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ``ModelBackend`` that keeps the session's user in the cache.
+
+    The key includes the user's version, which ``invalidate_user`` bumps on
+    every save, so profile edits, password changes and logins are visible
+    on the next request. Session hash verification is left to Django.
+    """
+
+    def get_user(self, user_id):
+        version, = get_versions(('user', user_id))
+        key = USER_KEY.format(pk=user_id, version=version)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
@@ -0,0 +1,148 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from . import clock
+from .models import Post
+
+VERSION_KEY = 'blog:version:{model}:{pk}'
+POST_CARD_KEY = 'blog:post_card:{pk}:{versions}'
+PAGE_KEY = 'blog:page:{version}:{path}'
+FEED_KEY = 'blog:feed:{version}:{url}'
+COUNT_KEY = 'blog:count:{version}:{scope}'
+
+
+def version_key(model, pk):
+    return VERSION_KEY.format(model=model, pk=pk)
+
+
+def bump_version(model, pk):
+    """
+    Marks every cached fragment that depends on the object as stale.
+
+    Versions are timestamps rather than counters so that an evicted version
+    never resurrects fragments cached under an older value.
+    """
+    if pk is not None:
+        cache.set(version_key(model, pk), time.time_ns(), None)
+
+
+def get_versions(*objects):
+    """Returns the current versions of ``(model, pk)`` pairs in one call."""
+    keys = [version_key(model, pk) for model, pk in objects]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def post_card_key(post):
+    versions = get_versions(
+        ('post', post.pk),
+        ('category', post.category_id),
+        ('location', post.location_id),
+        ('user', post.author_id),
+    )
+    return POST_CARD_KEY.format(
+        pk=post.pk, versions='.'.join(map(str, versions))
+    )
+
+
+def page_cache_key(path):
+    """Returns the full-page cache key for the path at the current version."""
+    version, = get_versions(('pages', 'all'))
+    return PAGE_KEY.format(
+        version=version, path=hashlib.md5(path.encode()).hexdigest()
+    )
+
+
+def feed_cache_key(url):
+    """
+    Returns the feed cache key for the URL and the current feeds version.
+
+    Feeds don't show comments, so they have their own version, which only
+    post, category and user changes bump.
+    """
+    version, = get_versions(('feeds', 'all'))
+    key = FEED_KEY.format(
+        version=version, url=hashlib.md5(url.encode()).hexdigest()
+    )
+    return key, version
+
+
+def page_cache_timeout():
+    """
+    Returns the page cache TTL, capped at the next scheduled publication.
+
+    A deferred post doesn't trigger any signal when its ``pub_date`` comes,
+    so cached pages must expire by then on their own.
+    """
+    timeout = settings.PAGE_CACHE_TIMEOUT
+    next_pub_date = Post.objects.filter(
+        is_published=True, pub_date__gt=clock.now()
+    ).order_by('pub_date').values_list('pub_date', flat=True).first()
+    if next_pub_date is not None:
+        visible_at = clock.ceil_time(next_pub_date)
+        timeout = min(
+            timeout,
+            math.ceil((visible_at - timezone.now()).total_seconds())
+        )
+    return max(timeout, 1)
+
+
+def count_cache_key(scope):
+    """Returns the key of a cached post count, e.g. ``category:1``."""
+    version, = get_versions(('counts', 'all'))
+    return COUNT_KEY.format(version=version, scope=scope)
+
+
+def is_page_cacheable(request):
+    return (
+        request.method in ('GET', 'HEAD')
+        and not request.user.is_authenticated
+    )
+
+
+def conditional_page_response(request, response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return get_conditional_response(
+        request, etag=etag, last_modified=last_modified, response=response
+    )
+
+
+def get_cached_page(request, key):
+    """Returns the cached page response, or ``None`` on a miss."""
+    cached = cache.get(key)
+    if cached is None:
+        return None
+    content, content_type, etag, last_modified = cached
+    return conditional_page_response(
+        request, HttpResponse(content, content_type=content_type),
+        etag, last_modified
+    )
+
+
+def cache_page(request, response, key):
+    """Stores a successful response in the page cache."""
+    if response.status_code != 200 or response.cookies:
+        return response
+    if hasattr(response, 'render'):
+        response.render()
+    etag = quote_etag(hashlib.md5(response.content).hexdigest())
+    last_modified = int(timezone.now().timestamp())
+    cache.set(
+        key,
+        (response.content, response['Content-Type'], etag, last_modified),
+        page_cache_timeout()
+    )
+    return conditional_page_response(request, response, etag, last_modified)
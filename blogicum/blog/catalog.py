@@ -0,0 +1,134 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.db.models.query import ModelIterable
+
+_lock = threading.Lock()
+_state = {
+    'version': None, 'expires': 0, 'categories': {}, 'locations': {}
+}
+
+
+def _is_stale(version):
+    return (
+        _state['version'] != version or time.monotonic() >= _state['expires']
+    )
+
+
+def _load():
+    """
+    Returns the in-process snapshot of categories and locations.
+
+    The snapshot is stamped with a version kept in the shared cache, so a
+    change made in any process invalidates the copies in all of them when
+    the cache is shared. It is also reloaded every ``CATALOG_CACHE_TIMEOUT``
+    seconds, which bounds staleness with a per-process cache or changes
+    made without signals. It is read from the primary, as a lagging replica
+    would keep the old rows for the whole period.
+    """
+    from .cache import get_versions
+    from .models import Category, Location
+
+    version, = get_versions(('catalog', 'all'))
+    if _is_stale(version):
+        with _lock:
+            if _is_stale(version):
+                _state['categories'] = Category.objects.using(
+                    'default'
+                ).in_bulk()
+                _state['locations'] = Location.objects.using(
+                    'default'
+                ).in_bulk()
+                _state['version'] = version
+                _state['expires'] = (
+                    time.monotonic() + settings.CATALOG_CACHE_TIMEOUT
+                )
+    return _state
+
+
+def categories():
+    """Returns every category by id."""
+    return _load()['categories']
+
+
+def locations():
+    """Returns every location by id."""
+    return _load()['locations']
+
+
+def published_categories():
+    """Returns published categories ordered by title."""
+    return sorted(
+        (
+            category for category in categories().values()
+            if category.is_published
+        ),
+        key=lambda category: category.title
+    )
+
+
+def unpublished_category_ids():
+    return [
+        pk for pk, category in categories().items()
+        if not category.is_published
+    ]
+
+
+def get_published_category(slug):
+    """Returns the published category with the slug, or ``None``."""
+    for category in categories().values():
+        if category.slug == slug and category.is_published:
+            return category
+    return None
+
+
+def attach(posts):
+    """
+    Sets ``category`` and ``location`` of the posts from the snapshot.
+
+    Rows missing from the snapshot, e.g. created by another process since it
+    was loaded, are left to the regular lazy lookup.
+    """
+    state = _load()
+    for post in posts:
+        category = state['categories'].get(post.category_id)
+        if category is not None:
+            post.category = category
+        location = state['locations'].get(post.location_id)
+        if location is not None:
+            post.location = location
+
+
+class PostQuerySet(QuerySet):
+    """QuerySet that can take categories and locations from the catalog."""
+
+    _attach_catalog = False
+
+    def with_catalog(self):
+        """Attaches category and location from memory instead of a JOIN."""
+        clone = self._chain()
+        clone._attach_catalog = True
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._attach_catalog = self._attach_catalog
+        return clone
+
+    def delete(self):
+        from .models import deleting_posts
+
+        with deleting_posts(self.values_list('pk', flat=True)):
+            return super().delete()
+
+    def _fetch_all(self):
+        fetched = self._result_cache is None
+        super()._fetch_all()
+        if (
+            fetched
+            and self._attach_catalog
+            and self._iterable_class is ModelIterable
+        ):
+            attach(self._result_cache)
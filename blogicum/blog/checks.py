@@ -0,0 +1,39 @@
+from django.core import checks
+from django.db import connections
+
+from .search import FTS_TABLE, FTS_TRIGGERS
+
+
+@checks.register(checks.Tags.database)
+def check_search_triggers(app_configs, databases=None, **kwargs):
+    """
+    Reports SQLite databases whose search index is no longer kept in sync.
+
+    The triggers are dropped together with ``blog_post`` whenever a
+    migration rebuilds the table, after which new and edited posts silently
+    stop showing up in search results.
+    """
+    errors = []
+    for alias in databases or ():
+        connection = connections[alias]
+        if connection.vendor != 'sqlite':
+            continue
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT type, name FROM sqlite_master "
+                "WHERE type IN ('table', 'trigger') AND tbl_name IN (%s, %s)",
+                (FTS_TABLE, 'blog_post')
+            )
+            names = {name for _, name in cursor.fetchall()}
+        if FTS_TABLE not in names:
+            continue
+        missing = [name for name in FTS_TRIGGERS if name not in names]
+        if missing:
+            errors.append(checks.Error(
+                'В базе {} нет триггеров поискового индекса: {}.'.format(
+                    alias, ', '.join(missing)
+                ),
+                hint='Выполните python manage.py rebuild_search_index.',
+                id='blog.E001',
+            ))
+    return errors
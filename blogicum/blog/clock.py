@@ -0,0 +1,62 @@
+import asyncio
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.deprecation import MiddlewareMixin
+
+_request_now = ContextVar('blog_request_now', default=None)
+
+
+def floor_time(value):
+    """Rounds the datetime down to ``settings.NOW_GRANULARITY`` seconds."""
+    granularity = settings.NOW_GRANULARITY
+    if granularity <= 1:
+        return value.replace(microsecond=0)
+    timestamp = value.timestamp()
+    return datetime.fromtimestamp(
+        timestamp - timestamp % granularity, tz=value.tzinfo
+    )
+
+
+def ceil_time(value):
+    """Rounds the datetime up to ``settings.NOW_GRANULARITY`` seconds."""
+    floored = floor_time(value)
+    if floored == value:
+        return value
+    return floored + timedelta(seconds=max(settings.NOW_GRANULARITY, 1))
+
+
+def now():
+    """
+    Returns the current time shared by the whole request.
+
+    The value is computed once per request by ``RequestClockMiddleware`` and
+    rounded down, so queries and caches stay stable within the granularity
+    window. Outside a request the rounded current time is returned.
+    """
+    value = _request_now.get()
+    if value is None:
+        return floor_time(timezone.now())
+    return value
+
+
+class RequestClockMiddleware(MiddlewareMixin):
+    """Fixes ``blog.clock.now()`` for the duration of a request."""
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        token = _request_now.set(floor_time(timezone.now()))
+        try:
+            return self.get_response(request)
+        finally:
+            _request_now.reset(token)
+
+    async def __acall__(self, request):
+        token = _request_now.set(floor_time(timezone.now()))
+        try:
+            return await self.get_response(request)
+        finally:
+            _request_now.reset(token)
@@ -0,0 +1,139 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.feedgenerator import (Atom1Feed, Rss201rev2Feed,
+                                        SyndicationFeed)
+from django.utils.http import quote_etag
+
+from . import clock
+from .cache import (conditional_page_response, feed_cache_key,
+                    get_cached_page, page_cache_timeout)
+
+
+class JSONFeed(SyndicationFeed):
+    """JSON Feed 1.1 (https://jsonfeed.org/version/1.1) generator."""
+
+    content_type = 'application/feed+json; charset=utf-8'
+
+    def write(self, outfile, encoding):
+        feed = {
+            'version': 'https://jsonfeed.org/version/1.1',
+            'title': self.feed['title'],
+            'home_page_url': self.feed['link'],
+            'feed_url': self.feed['feed_url'],
+            'description': self.feed['description'],
+            'language': self.feed['language'],
+            'items': [self.item(item) for item in self.items],
+        }
+        json.dump(feed, outfile, ensure_ascii=False)
+
+    def item(self, item):
+        data = {
+            'id': item['unique_id'],
+            'url': item['link'],
+            'title': item['title'],
+            'content_text': item['description'],
+            'date_published': item['pubdate'].isoformat(),
+            'date_modified': item['updateddate'].isoformat(),
+            'authors': [
+                {'name': item['author_name'], 'url': item['author_link']}
+            ],
+        }
+        if item['categories']:
+            data['tags'] = list(item['categories'])
+        return data
+
+
+GENERATORS = {
+    'rss': Rss201rev2Feed,
+    'atom': Atom1Feed,
+    'json': JSONFeed,
+}
+
+
+def last_modified(posts):
+    """
+    Returns when the newest of the posts appeared or was edited.
+
+    A post is shown from ``pub_date`` rounded up to the request clock, so
+    that is when a scheduled post appears in the feed.
+    """
+    times = [
+        max(clock.ceil_time(post.pub_date), post.updated_at)
+        for post in posts
+    ]
+    return max(times, default=timezone.now())
+
+
+def render_feed(request, feed_format, title, link, description, posts):
+    """Serializes the latest ``FEED_ITEMS`` posts in the feed format."""
+    posts = list(posts[:settings.FEED_ITEMS])
+    generator = GENERATORS[feed_format](
+        title=title,
+        link=request.build_absolute_uri(link),
+        description=description,
+        language=settings.LANGUAGE_CODE,
+        feed_url=request.build_absolute_uri(),
+    )
+    for post in posts:
+        url = request.build_absolute_uri(
+            reverse('blog:post_detail', kwargs={'post_id': post.pk})
+        )
+        generator.add_item(
+            title=post.title,
+            link=url,
+            unique_id=url,
+            description=post.text,
+            pubdate=post.pub_date,
+            updateddate=max(post.pub_date, post.updated_at),
+            author_name=post.author.username,
+            author_link=request.build_absolute_uri(
+                reverse(
+                    'blog:profile',
+                    kwargs={'username': post.author.username}
+                )
+            ),
+            categories=[post.category.title] if post.category else (),
+        )
+    return (
+        generator.writeString('utf-8').encode(),
+        generator.content_type,
+        last_modified(posts),
+    )
+
+
+def feed_response(request, feed_format, get_feed):
+    """
+    Returns the feed from the cache, rendering it only after changes.
+
+    ``get_feed()`` returns the ``render_feed()`` arguments and is only
+    called on a cache miss, so it may look objects up in the database.
+
+    The document is cached under the feeds version and expires by the next
+    scheduled publication, so polls between changes don't touch the
+    database. ``ETag`` and ``Last-Modified`` let feed readers revalidate
+    with a 304. ``Last-Modified`` is the later of the version stamp and
+    the newest item, so it never goes back, e.g. when the newest post is
+    deleted.
+    """
+    key, version = feed_cache_key(request.build_absolute_uri())
+    response = get_cached_page(request, key)
+    if response is not None:
+        return response
+    content, content_type, modified = render_feed(
+        request, feed_format, **get_feed()
+    )
+    etag = quote_etag(hashlib.md5(content).hexdigest())
+    modified = max(int(modified.timestamp()), version // 10 ** 9)
+    cache.set(
+        key, (content, content_type, etag, modified), page_cache_timeout()
+    )
+    return conditional_page_response(
+        request, HttpResponse(content, content_type=content_type),
+        etag, modified
+    )
@@ -1,4 +1,6 @@
 from django import forms
+from django.conf import settings
+from django.template.defaultfilters import filesizeformat
 from django.contrib.auth.forms import UserChangeForm
 
 from .models import Comment, Post, User
@@ -25,6 +27,16 @@ class PostForm(forms.ModelForm):
             )
         }
 
+    def clean_image(self):
+        """Ограничиваем размер загружаемого изображения."""
+        image = self.cleaned_data.get('image')
+        if image and image.size > settings.POST_IMAGE_MAX_SIZE:
+            raise forms.ValidationError(
+                'Размер изображения не должен превышать '
+                f'{filesizeformat(settings.POST_IMAGE_MAX_SIZE)}.'
+            )
+        return image
+
 
 class UserForm(UserChangeForm):
     """Форма редактирования пользователя."""
@@ -0,0 +1,58 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+FORMATS = {'jpg': 'JPEG', 'webp': 'WEBP'}
+
+
+def rendition_name(name, rendition, extension):
+    """Returns the storage name of a rendition stored next to the original."""
+    base, _ = os.path.splitext(name)
+    return f'{base}_{rendition}.{extension}'
+
+
+def renditions_exist(name, storage=default_storage):
+    return all(
+        storage.exists(rendition_name(name, rendition, extension))
+        for rendition in settings.POST_IMAGE_RENDITIONS
+        for extension in FORMATS
+    )
+
+
+def generate_renditions(name, storage=default_storage):
+    """
+    Writes every rendition of the image from ``POST_IMAGE_RENDITIONS``.
+
+    Images are rotated according to their EXIF orientation, stripped of
+    metadata and downscaled (never upscaled) to the rendition width.
+    """
+    with storage.open(name, 'rb') as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGB')
+
+    for rendition, width in settings.POST_IMAGE_RENDITIONS.items():
+        resized = image.copy()
+        resized.thumbnail((width, width * 4), Image.LANCZOS)
+        for extension, image_format in FORMATS.items():
+            buffer = BytesIO()
+            resized.save(
+                buffer, image_format,
+                quality=settings.POST_IMAGE_QUALITY, optimize=True
+            )
+            target = rendition_name(name, rendition, extension)
+            if storage.exists(target):
+                storage.delete(target)
+            storage.save(target, ContentFile(buffer.getvalue()))
+
+
+def srcset(name, extension, storage=default_storage):
+    """Returns the ``srcset`` attribute value for the image renditions."""
+    return ', '.join(
+        f'{storage.url(rendition_name(name, rendition, extension))} {width}w'
+        for rendition, width in settings.POST_IMAGE_RENDITIONS.items()
+    )
@@ -0,0 +1,156 @@
+import traceback
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connections
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .cache import bump_version
+from . import timeline
+from .images import generate_renditions
+from .models import Job, Post
+
+TASKS = {}
+FAILURE_HANDLERS = {}
+
+
+def task(func):
+    """Registers the function as a job that can be enqueued by name."""
+    TASKS[func.__name__] = func
+    return func
+
+
+def on_failure(task_func):
+    """Registers a function to call with the payload once the task fails."""
+    def register(func):
+        FAILURE_HANDLERS[task_func.__name__] = func
+        return func
+    return register
+
+
+def enqueue(task_name, **payload):
+    """
+    Adds a job to the queue unless the same job is already waiting.
+
+    With ``JOBS_ALWAYS_EAGER`` the job runs immediately in the caller.
+    """
+    if settings.JOBS_ALWAYS_EAGER:
+        TASKS[task_name](**payload)
+        return None
+    job = Job.objects.filter(
+        name=task_name, payload=payload, status=Job.PENDING
+    ).first()
+    if job is None:
+        job = Job.objects.create(name=task_name, payload=payload)
+    return job
+
+
+def active_payloads(task_name):
+    """Returns payloads of the task's jobs that are waiting or running."""
+    return list(Job.objects.filter(
+        name=task_name, status__in=(Job.PENDING, Job.RUNNING)
+    ).values_list('payload', flat=True))
+
+
+def prune_jobs():
+    """Deletes jobs done more than ``JOBS_DONE_RETENTION`` seconds ago."""
+    deleted, _ = Job.objects.filter(
+        status=Job.DONE,
+        run_after__lt=timezone.now() - timedelta(
+            seconds=settings.JOBS_DONE_RETENTION
+        )
+    ).delete()
+    return deleted
+
+
+def claim_jobs(limit):
+    """
+    Marks up to ``limit`` due jobs as running and returns their ids.
+
+    Running jobs whose lock is older than ``JOBS_TIMEOUT`` are considered
+    abandoned by a crashed worker and are claimed again.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.JOBS_TIMEOUT)
+    candidates = Job.objects.filter(
+        Q(status=Job.PENDING, run_after__lte=now)
+        | Q(status=Job.RUNNING, locked_at__lt=stale)
+    ).values_list('pk', 'status', 'locked_at')[:limit]
+    claimed = []
+    for pk, status, locked_at in candidates:
+        # The lock time read above acts as a version: if another worker has
+        # re-claimed a stale job in the meantime, the update matches nothing.
+        if Job.objects.filter(
+            pk=pk, status=status, locked_at=locked_at
+        ).update(
+            status=Job.RUNNING,
+            locked_at=now,
+            attempts=F('attempts') + 1
+        ):
+            claimed.append(pk)
+    return claimed
+
+
+def init_worker():
+    """Process pool initializer: sets Django up in a fresh process."""
+    django.setup()
+    connections.close_all()
+
+
+def execute_job(pk):
+    """Runs a claimed job, scheduling a retry with backoff on failure."""
+    job = Job.objects.get(pk=pk)
+    try:
+        TASKS[job.name](**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts < settings.JOBS_MAX_ATTEMPTS:
+            job.status = Job.PENDING
+            job.run_after = timezone.now() + timedelta(
+                seconds=settings.JOBS_RETRY_DELAY * 2 ** (job.attempts - 1)
+            )
+        else:
+            job.status = Job.FAILED
+    else:
+        job.status = Job.DONE
+    job.locked_at = None
+    job.save(update_fields=('status', 'run_after', 'locked_at', 'last_error'))
+    if job.status == Job.FAILED and job.name in FAILURE_HANDLERS:
+        FAILURE_HANDLERS[job.name](**job.payload)
+    connections.close_all()
+    return job.status
+
+
+@task
+def process_post_image(post_id, name):
+    """Generates the image renditions and refreshes the post's card."""
+    generate_renditions(name, default_storage)
+    bump_version('post', post_id)
+    bump_version('pages', 'all')
+
+
+@on_failure(process_post_image)
+def show_original_image(post_id, name):
+    """Refreshes the post's card, which falls back to the original image."""
+    bump_version('post', post_id)
+    bump_version('pages', 'all')
+
+
+@task
+def fan_out_post(post_id):
+    """Pushes the post into the home timelines of the author's followers."""
+    timeline.fan_out(post_id)
+
+
+@task
+def fan_out_author(author_id):
+    """Pushes the author's latest posts into the followers' timelines."""
+    for post_id in Post.objects.filter(
+        author_id=author_id, is_published=True
+    ).order_by('-pub_date').values_list(
+        'pk', flat=True
+    )[:settings.TIMELINE_BACKFILL]:
+        timeline.fan_out(post_id)
@@ -0,0 +1,277 @@
+import json
+import math
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import (setup_databases, setup_test_environment,
+                               teardown_databases, teardown_test_environment)
+from django.urls import reverse
+from django.utils import timezone
+from faker import Faker
+from mixer.backend.django import mixer
+
+from blog import urls as blog_urls
+from blog.models import Category, Comment, Location, Post, User
+from pages import urls as pages_urls
+
+BATCH_SIZE = 5000
+
+
+def percentile(values, fraction):
+    """Returns the nearest-rank percentile of sorted values."""
+    return values[max(math.ceil(fraction * len(values)), 1) - 1]
+
+
+class QueryTimer:
+    """``execute_wrapper`` hook that counts and times SQL queries."""
+
+    def __init__(self):
+        self.queries = 0
+        self.time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += time.perf_counter() - started
+            self.queries += 1
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет тестовую базу синтетическими данными, обходит все '
+        'маршруты blog и pages и сохраняет задержки и число SQL-запросов '
+        'в JSON. С --baseline сравнивает результат с сохранённым.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=100000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument(
+            '--requests', type=int, default=20,
+            help='Количество запросов к каждому маршруту.'
+        )
+        parser.add_argument(
+            '--cold', action='store_true',
+            help='Очищать кэш перед каждым запросом.'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--output', default='benchmark.json',
+            help='Файл для результатов.'
+        )
+        parser.add_argument(
+            '--baseline',
+            help='Файл с результатами для сравнения.'
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='Допустимый рост p95 относительно baseline (доля).'
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            started = time.perf_counter()
+            fixtures = self.seed(options)
+            self.stdout.write(
+                f'Данные созданы за {time.perf_counter() - started:.1f} с'
+            )
+            routes = self.measure(fixtures, options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        result = {
+            'dataset': {
+                key: options[key]
+                for key in ('users', 'posts', 'comments', 'categories')
+            },
+            'requests': options['requests'],
+            'cold': options['cold'],
+            'routes': routes,
+        }
+        with open(options['output'], 'w') as output:
+            json.dump(result, output, indent=2, ensure_ascii=False)
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты сохранены в {options["output"]}'
+        ))
+        if options['baseline']:
+            self.compare(routes, options['baseline'], options['tolerance'])
+
+    def seed(self, options):
+        rng = random.Random(options['seed'])
+        fake = Faker('ru_RU')
+        fake.seed_instance(options['seed'])
+        sentences = [fake.sentence() for _ in range(500)]
+        paragraphs = [fake.paragraph(nb_sentences=5) for _ in range(500)]
+        now = timezone.now()
+
+        categories = mixer.cycle(options['categories']).blend(
+            Category,
+            slug=mixer.sequence('category-{0}'),
+            is_published=(rng.random() > 0.1
+                          for _ in range(options['categories'])),
+        )
+        locations = mixer.cycle(15).blend(Location)
+        User.objects.bulk_create(
+            (User(username=f'user{i}', password='!')
+             for i in range(options['users'])),
+            batch_size=BATCH_SIZE
+        )
+        user_ids = list(User.objects.values_list('pk', flat=True))
+
+        Post.objects.bulk_create(
+            (
+                Post(
+                    title=rng.choice(sentences)[:256],
+                    text=rng.choice(paragraphs),
+                    pub_date=now - timedelta(
+                        minutes=rng.randint(-60 * 24 * 7, 60 * 24 * 365 * 2)
+                    ),
+                    author_id=rng.choice(user_ids),
+                    category=rng.choice(categories),
+                    location=rng.choice(locations + [None]),
+                    is_published=rng.random() > 0.02,
+                )
+                for _ in range(options['posts'])
+            ),
+            batch_size=BATCH_SIZE
+        )
+        post_ids = list(Post.objects.values_list('pk', flat=True))
+
+        counts = dict.fromkeys(post_ids, 0)
+        comments = []
+        for _ in range(options['comments']):
+            post_id = rng.choice(post_ids)
+            counts[post_id] += 1
+            comments.append(Comment(
+                post_id=post_id,
+                author_id=rng.choice(user_ids),
+                text=rng.choice(sentences),
+            ))
+        Comment.objects.bulk_create(comments, batch_size=BATCH_SIZE)
+        posts = Post.objects.in_bulk(post_ids)
+        for post_id, count in counts.items():
+            posts[post_id].comment_count = count
+        Post.objects.bulk_update(
+            posts.values(), ('comment_count',), batch_size=BATCH_SIZE
+        )
+
+        post = Post.objects.filter(
+            is_published=True,
+            category__is_published=True,
+            pub_date__lte=now - timedelta(hours=1),
+        ).order_by('-comment_count').first()
+        if post is None:
+            raise CommandError(
+                'Среди созданных данных нет опубликованного поста в '
+                'опубликованной категории; увеличьте --posts и --categories.'
+            )
+        comment = mixer.blend(Comment, post=post, author=post.author)
+        Post.objects.filter(pk=post.pk).update(
+            comment_count=post.comment_count + 1
+        )
+        return {
+            'user': post.author,
+            'category_slug': post.category.slug,
+            'username': post.author.username,
+            'post_id': post.pk,
+            'comment_id': comment.pk,
+            'feed_format': 'rss',
+        }
+
+    def get_routes(self, fixtures):
+        for namespace, module in (('blog', blog_urls), ('pages', pages_urls)):
+            for pattern in module.urlpatterns:
+                kwargs = {
+                    name: fixtures[name]
+                    for name in pattern.pattern.converters
+                }
+                view_class = getattr(pattern.callback, 'view_class', None)
+                if view_class is not None and not hasattr(view_class, 'get'):
+                    self.stdout.write(
+                        f'{namespace}:{pattern.name}: пропущен, только POST'
+                    )
+                    continue
+                login_required = view_class is not None and issubclass(
+                    view_class, LoginRequiredMixin
+                )
+                yield (
+                    f'{namespace}:{pattern.name}',
+                    reverse(f'{namespace}:{pattern.name}', kwargs=kwargs),
+                    login_required,
+                )
+
+    def measure(self, fixtures, options):
+        anonymous = Client()
+        authenticated = Client()
+        authenticated.force_login(fixtures['user'])
+        results = {}
+        for name, url, login_required in self.get_routes(fixtures):
+            client = authenticated if login_required else anonymous
+            latencies, queries, sql_times = [], [], []
+            status = None
+            for _ in range(options['requests']):
+                if options['cold']:
+                    cache.clear()
+                timer = QueryTimer()
+                with connection.execute_wrapper(timer):
+                    started = time.perf_counter()
+                    response = client.get(url)
+                    latencies.append(time.perf_counter() - started)
+                status = response.status_code
+                queries.append(timer.queries)
+                sql_times.append(timer.time)
+            latencies.sort()
+            results[name] = {
+                'url': url,
+                'authenticated': login_required,
+                'status': status,
+                'p50_ms': round(statistics.median(latencies) * 1000, 3),
+                'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+                'queries': max(queries),
+                'sql_ms': round(statistics.median(sql_times) * 1000, 3),
+            }
+            self.stdout.write(
+                '{name}: p50 {p50_ms} мс, p95 {p95_ms} мс, '
+                'запросов {queries}, SQL {sql_ms} мс'.format(
+                    name=name, **results[name]
+                )
+            )
+        return results
+
+    def compare(self, routes, baseline_path, tolerance):
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)['routes']
+        regressions = []
+        for name, base in baseline.items():
+            current = routes.get(name)
+            if current is None:
+                continue
+            if current['queries'] > base['queries']:
+                regressions.append(
+                    f'{name}: запросов {current["queries"]} '
+                    f'(было {base["queries"]})'
+                )
+            if current['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+                regressions.append(
+                    f'{name}: p95 {current["p95_ms"]} мс '
+                    f'(было {base["p95_ms"]} мс)'
+                )
+        if regressions:
+            raise CommandError(
+                'Обнаружены регрессии:\n' + '\n'.join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS('Регрессий не обнаружено.'))
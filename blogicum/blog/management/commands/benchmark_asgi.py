@@ -0,0 +1,153 @@
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.models import Post
+from blog.views import filtering
+
+from .benchmark import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность синхронных и асинхронных '
+        'view ленты и поста под ASGI при высокой конкурентности. Запросы '
+        'выполняются к рабочей базе, данные не изменяются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=100)
+        parser.add_argument(
+            '--requests', type=int, default=2000,
+            help='Количество запросов для каждого режима.'
+        )
+        parser.add_argument(
+            '--worker', choices=('sync', 'async'),
+            help='Служебный режим: нагрузка одного варианта view.'
+        )
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            result = asyncio.run(self.load(options))
+            self.stdout.write(json.dumps(result))
+            return
+        # Воркер запускается через python -m django, чтобы команда работала
+        # и при вызове не из manage.py, например через call_command.
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE,
+            'PYTHONPATH': os.pathsep.join(filter(None, (
+                str(settings.BASE_DIR), os.environ.get('PYTHONPATH')
+            ))),
+        }
+        results = {}
+        for mode in ('sync', 'async'):
+            worker = subprocess.run(
+                [
+                    sys.executable, '-m', 'django', 'benchmark_asgi',
+                    '--worker', mode,
+                    '--concurrency', str(options['concurrency']),
+                    '--requests', str(options['requests']),
+                ],
+                env={**env, 'ASYNC_VIEWS': str(mode == 'async')},
+                capture_output=True, text=True,
+            )
+            if worker.returncode:
+                raise CommandError(
+                    f'Замер {mode} завершился с ошибкой:\n{worker.stderr}'
+                )
+            results[mode] = json.loads(worker.stdout.strip().splitlines()[-1])
+            self.stdout.write(
+                '{mode}: {rps} запросов/с, p50 {p50_ms} мс, p95 {p95_ms} мс, '
+                'ошибок {errors}'.format(mode=mode, **results[mode])
+            )
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def get_paths(self):
+        """Адреса видимых анонимному читателю страниц из рабочей базы."""
+        paths = ['/']
+        posts = filtering(Post.objects)
+        post = posts.first()
+        if post:
+            paths.append(f'/{post.category.slug}/')
+            paths.append(f'/profile/{post.author.username}/')
+            paths.append(f'/posts/{post.pk}/')
+        commented = posts.filter(comment_count__gt=0).first()
+        if commented:
+            paths.append(f'/posts/{commented.pk}/')
+        return paths
+
+    async def request(self, application, path):
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': b'',
+            'root_path': '',
+            'headers': [(b'host', b'localhost')],
+            'client': ('127.0.0.1', 0),
+            'server': ('localhost', 80),
+        }
+        status = None
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+
+        await application(scope, receive, send)
+        return status
+
+    async def load(self, options):
+        from asgiref.sync import sync_to_async
+        from django.core.asgi import get_asgi_application
+
+        application = get_asgi_application()
+        paths = await sync_to_async(self.get_paths)()
+        for path in paths:
+            status = await self.request(application, path)
+            if status != 200:
+                raise CommandError(
+                    f'{path} отвечает {status} вместо 200, замер отменён.'
+                )
+        semaphore = asyncio.Semaphore(options['concurrency'])
+        latencies = []
+        errors = 0
+
+        async def worker(number):
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                status = await self.request(
+                    application, paths[number % len(paths)]
+                )
+                latencies.append(time.perf_counter() - started)
+                if status != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(worker(number) for number in range(options['requests']))
+        )
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+        return {
+            'rps': round(len(latencies) / elapsed, 1),
+            'p50_ms': round(statistics.median(latencies) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+            'errors': errors,
+        }
@@ -0,0 +1,95 @@
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blog.cache import bump_version
+from blog.models import Category, Comment, Post
+from blog.views import filtering
+
+FULL_SCAN = re.compile(
+    r'\bSCAN (?:TABLE )?(?P<sqlite>blog_\w+)\b(?! USING (?:COVERING )?INDEX)'
+    r'|Seq Scan on (?P<postgres>blog_\w+)'
+)
+TEMP_SORT = re.compile(
+    r'USE TEMP B-TREE FOR ORDER BY|^\s*(?:->\s+)?Sort\b', re.MULTILINE
+)
+CHECKED_TABLES = (Post._meta.db_table, Comment._meta.db_table)
+
+
+class Command(BaseCommand):
+    help = (
+        'Запускает EXPLAIN для запросов лент и комментариев и завершается '
+        'с ошибкой, если какой-либо из них сканирует таблицу целиком или '
+        'сортирует строки вместо чтения индекса по порядку.'
+    )
+
+    def create_categories(self):
+        """
+        Создаём опубликованные и скрытую категории на время проверки.
+
+        С пустым каталогом или одной категорией условие на категорию в
+        запросах лент вырождается, и план проверялся бы не тот, что на
+        сайте.
+        """
+        Category.objects.bulk_create(
+            Category(
+                title=slug, description='', slug=slug, is_published=published
+            )
+            for slug, published in (
+                ('check-query-plans-published', True),
+                ('check-query-plans-another', True),
+                ('check-query-plans-hidden', False),
+            )
+        )
+        bump_version('catalog', 'all')
+        return Category.objects.get(slug='check-query-plans-published')
+
+    def get_queries(self, category):
+        limit = settings.POST_PAGINATION
+        return {
+            'index': filtering(Post.objects)[:limit],
+            'category_posts': filtering(category.posts)[:limit],
+            'profile': filtering(Post.objects.filter(author_id=1))[:limit],
+            'own_profile': Post.objects.filter(
+                author_id=1
+            ).order_by('-pub_date')[:limit],
+            'comments': Comment.objects.select_related('author').filter(
+                post_id=1
+            ).order_by('creation_date', 'id'),
+        }
+
+    def check_plan(self, name, queryset, verbosity):
+        plan = queryset.explain()
+        if verbosity > 1:
+            self.stdout.write(f'{name}:\n{plan}\n')
+        problems = [
+            f'полный просмотр {table}'
+            for table in (
+                match.group('sqlite') or match.group('postgres')
+                for match in FULL_SCAN.finditer(plan)
+            )
+            if table in CHECKED_TABLES
+        ]
+        if TEMP_SORT.search(plan):
+            problems.append('сортировка без индекса')
+        if problems:
+            self.stderr.write(f'{name}: {", ".join(problems)}')
+            return False
+        self.stdout.write(self.style.SUCCESS(f'{name}: OK'))
+        return True
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            queries = self.get_queries(self.create_categories())
+            failed = [
+                name for name, queryset in queries.items()
+                if not self.check_plan(name, queryset, options['verbosity'])
+            ]
+            transaction.set_rollback(True)
+        bump_version('catalog', 'all')
+        if failed:
+            raise CommandError(
+                f'Запросы без индекса: {", ".join(failed)}'
+            )
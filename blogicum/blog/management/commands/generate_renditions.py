@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import generate_renditions, renditions_exist
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии изображений существующих постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Пересоздать копии, даже если они уже есть.'
+        )
+
+    def handle(self, *args, **options):
+        created = 0
+        posts = Post.objects.exclude(image='').only('image')
+        for post in posts.iterator():
+            image = post.image
+            if options['force'] or not renditions_exist(
+                image.name, image.storage
+            ):
+                try:
+                    generate_renditions(image.name, image.storage)
+                except (OSError, ValueError) as error:
+                    self.stderr.write(f'{image.name}: {error}')
+                    continue
+                created += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано изображений: {created}')
+        )
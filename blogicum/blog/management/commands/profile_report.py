@@ -0,0 +1,87 @@
+import glob
+import os
+import pstats
+import sys
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.profiling import make_token
+
+
+class Command(BaseCommand):
+    help = (
+        'Объединяет профили из PROFILING_DIR: стеки .collapsed в один файл '
+        'для построения flamegraph, статистику .prof в общий отчёт.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dir', default=None,
+            help='Каталог с профилями (по умолчанию PROFILING_DIR).'
+        )
+        parser.add_argument(
+            '--view',
+            help='Учитывать только профили с этой подстрокой в имени view.'
+        )
+        parser.add_argument(
+            '--collapsed-output',
+            help='Файл для объединённых стеков (по умолчанию stdout).'
+        )
+        parser.add_argument(
+            '--pstats-output',
+            help='Файл для объединённой статистики cProfile.'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=30,
+            help='Количество функций в текстовом отчёте.'
+        )
+        parser.add_argument(
+            '--make-token', action='store_true',
+            help='Вывести подписанное значение заголовка X-Blogicum-Profile.'
+        )
+
+    def handle(self, *args, **options):
+        if options['make_token']:
+            self.stdout.write(make_token())
+            return
+        directory = options['dir'] or settings.PROFILING_DIR
+        collapsed = self.find(directory, 'collapsed', options['view'])
+        profiles = self.find(directory, 'prof', options['view'])
+        if not collapsed and not profiles:
+            self.stderr.write(f'В {directory} нет профилей.')
+            return
+        if collapsed:
+            self.merge_collapsed(collapsed, options['collapsed_output'])
+        if profiles:
+            self.merge_profiles(profiles, options)
+
+    def find(self, directory, extension, view):
+        paths = sorted(glob.glob(os.path.join(directory, f'*.{extension}')))
+        if view:
+            paths = [path for path in paths if view in os.path.basename(path)]
+        return paths
+
+    def merge_collapsed(self, paths, output_path):
+        stacks = Counter()
+        for path in paths:
+            with open(path) as collapsed:
+                for line in collapsed:
+                    stack, _, count = line.rstrip('\n').rpartition(' ')
+                    if stack:
+                        stacks[stack] += int(count)
+        output = open(output_path, 'w') if output_path else self.stdout
+        try:
+            for stack, count in stacks.most_common():
+                output.write(f'{stack} {count}\n')
+        finally:
+            if output_path:
+                output.close()
+        self.stderr.write(f'Объединено стеков: {len(paths)} файлов.')
+
+    def merge_profiles(self, paths, options):
+        stats = pstats.Stats(*paths, stream=sys.stdout)
+        if options['pstats_output']:
+            stats.dump_stats(options['pstats_output'])
+        stats.sort_stats('cumulative').print_stats(options['limit'])
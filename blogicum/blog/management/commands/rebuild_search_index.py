@@ -0,0 +1,21 @@
+from importlib import import_module
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+search_index = import_module('blog.migrations.0015_post_search_index')
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересоздаёт триггеры и перестраивает полнотекстовый индекс постов '
+        '(SQLite FTS5).'
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Индекс FTS5 используется только с SQLite.')
+        with connection.cursor() as cursor:
+            for statement in search_index.RESTORE_SQL:
+                cursor.execute(statement)
+        self.stdout.write(self.style.SUCCESS('Индекс перестроен.'))
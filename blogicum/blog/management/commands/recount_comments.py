@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает денормализованные счётчики комментариев у постов.'
+
+    def handle(self, *args, **options):
+        counts = Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(
+            total=Count('pk')
+        ).values('total')
+        updated = Post.objects.update(
+            comment_count=Coalesce(Subquery(counts), 0)
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено постов: {updated}')
+        )
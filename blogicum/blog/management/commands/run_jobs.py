@@ -0,0 +1,54 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blog.jobs import claim_jobs, execute_job, init_worker, prune_jobs
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в пуле процессов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count() or 1,
+            help='Количество процессов-исполнителей.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить накопившиеся задачи и завершиться.'
+        )
+
+    pruned_at = None
+
+    def prune(self):
+        """Удаляем старые выполненные задачи, пока очередь пуста."""
+        now = time.monotonic()
+        if (
+            self.pruned_at is not None
+            and now - self.pruned_at < settings.JOBS_PRUNE_INTERVAL
+        ):
+            return
+        self.pruned_at = now
+        deleted = prune_jobs()
+        if deleted:
+            self.stdout.write(f'Удалено выполненных задач: {deleted}')
+
+    def handle(self, *args, **options):
+        processes = options['processes']
+        with ProcessPoolExecutor(processes, initializer=init_worker) as pool:
+            while True:
+                claimed = claim_jobs(processes * 2)
+                if not claimed:
+                    self.prune()
+                    if options['once']:
+                        break
+                    time.sleep(settings.JOBS_POLL_INTERVAL)
+                    continue
+                # SQLite connections must not be shared with forked children.
+                connections.close_all()
+                for pk, status in zip(claimed, pool.map(execute_job, claimed)):
+                    self.stdout.write(f'Задача {pk}: {status}')
@@ -0,0 +1,234 @@
+import mimetypes
+import os
+import posixpath
+import re
+from functools import lru_cache
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import (get_conditional_response, patch_cache_control,
+                                patch_vary_headers)
+from django.utils.http import http_date, parse_http_date_safe
+
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """
+    Byte range of an open file that can be passed to ``FileResponse``.
+
+    ``fileno()`` lets servers with ``wsgi.file_wrapper`` send the range with
+    ``sendfile()`` from the current offset, limited by ``Content-Length``.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Returns ``(start, end)`` of a single byte range, both inclusive.
+
+    Returns ``None`` when the whole file should be sent, including for
+    headers that are invalid or ask for several ranges, which are ignored as
+    RFC 9110 allows. Raises ``ValueError`` when the range can't be
+    satisfied.
+    """
+    match = RANGE_RE.match(header or '')
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start:
+        if not end:
+            return None
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start = int(start)
+        if end and int(end) < start:
+            return None
+        end = min(int(end), size - 1) if end else size - 1
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def file_etag(stat):
+    return '"{:x}-{:x}"'.format(stat.st_size, stat.st_mtime_ns)
+
+
+def is_immutable(path):
+    return path.startswith(settings.MEDIA_IMMUTABLE_PREFIXES)
+
+
+def range_is_fresh(request, etag, last_modified):
+    """Tells whether ``If-Range`` still matches the file."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def file_response(request, fullpath, stat, content_type):
+    """Streams the file, or the requested byte range of it."""
+    etag = file_etag(stat)
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is not None:
+        response['ETag'] = etag
+        return response
+
+    size = stat.st_size
+    try:
+        byte_range = None
+        if range_is_fresh(request, etag, last_modified):
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    file = open(fullpath, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            FileRange(file, start, end - start + 1),
+            status=206,
+            content_type=content_type
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def offload_response(fullpath, path, content_type):
+    """Asks the front server to send the file instead of the worker."""
+    response = HttpResponse(content_type=content_type)
+    if settings.MEDIA_SERVING == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_REDIRECT_LOCATION + quote(path)
+        )
+    else:
+        response['X-Sendfile'] = fullpath
+    return response
+
+
+def resolve(root, path):
+    """Returns the full path and ``stat`` of a file under ``root``."""
+    path = posixpath.normpath(path).lstrip('/')
+    fullpath = safe_join(root, path)
+    try:
+        stat = os.stat(fullpath)
+    except OSError:
+        raise Http404('Файл не найден.')
+    if not os.path.isfile(fullpath):
+        raise Http404('Файл не найден.')
+    return path, fullpath, stat
+
+
+def patch_file_cache(response, immutable, max_age):
+    if immutable:
+        patch_cache_control(
+            response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True
+        )
+    else:
+        patch_cache_control(response, public=True, max_age=max_age)
+
+
+def accepted_encodings(request):
+    """Returns content codings the client accepts, ignoring ``q=0``."""
+    encodings = set()
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = item.strip().partition(';')
+        if params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00'):
+            encodings.add(coding.strip().lower())
+    return encodings
+
+
+def media_view(request, path):
+    """
+    Serves an uploaded file from ``MEDIA_ROOT``.
+
+    Depending on ``MEDIA_SERVING`` the file is handed over to nginx or
+    Apache, or streamed by Django with range and conditional requests.
+    Uploads under ``MEDIA_IMMUTABLE_PREFIXES`` never change under the same
+    name, so they are cached by clients without revalidation.
+    """
+    path, fullpath, stat = resolve(settings.MEDIA_ROOT, path)
+    content_type, encoding = mimetypes.guess_type(path)
+    content_type = content_type or 'application/octet-stream'
+    if settings.MEDIA_SERVING == 'python':
+        response = file_response(request, fullpath, stat, content_type)
+    else:
+        response = offload_response(fullpath, path, content_type)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_file_cache(
+        response, is_immutable(path), settings.MEDIA_CACHE_TIMEOUT
+    )
+    return response
+
+
+@lru_cache()
+def hashed_static_names():
+    return frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+
+def static_view(request, path):
+    """
+    Serves a collected static file from ``STATIC_ROOT``.
+
+    A precompressed ``.br`` or ``.gz`` copy written by ``collectstatic`` is
+    sent instead of the file when the client accepts its encoding. Hashed
+    names from the manifest are cached by clients without revalidation.
+    """
+    path, fullpath, stat = resolve(settings.STATIC_ROOT, path)
+    content_type, _ = mimetypes.guess_type(path)
+    content_type = content_type or 'application/octet-stream'
+    accepted = accepted_encodings(request)
+    encoding = None
+    for candidate, extension in (('br', 'br'), ('gzip', 'gz')):
+        if candidate in accepted:
+            try:
+                stat = os.stat(f'{fullpath}.{extension}')
+            except OSError:
+                continue
+            fullpath = f'{fullpath}.{extension}'
+            encoding = candidate
+            break
+    response = file_response(request, fullpath, stat, content_type)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    patch_file_cache(
+        response, path in hashed_static_names(),
+        settings.STATIC_CACHE_TIMEOUT
+    )
+    return response
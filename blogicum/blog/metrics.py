@@ -0,0 +1,226 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger(__name__)
+
+TIME_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+_request_stats = ContextVar('blog_request_stats', default=None)
+
+
+class Histogram:
+    """Cumulative histogram in the Prometheus exposition format."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def render(self, name, labels):
+        lines = []
+        total = 0
+        for bucket, count in zip(self.buckets, self.counts):
+            total += count
+            lines.append(f'{name}_bucket{{{labels},le="{bucket}"}} {total}')
+        total += self.counts[-1]
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {total}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum}')
+        lines.append(f'{name}_count{{{labels}}} {total}')
+        return lines
+
+
+class ViewMetrics:
+    """Per-view metrics accumulated by the worker process."""
+
+    def __init__(self):
+        self.duration = Histogram(TIME_BUCKETS)
+        self.db_duration = Histogram(TIME_BUCKETS)
+        self.render_duration = Histogram(TIME_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+
+
+class MetricsRegistry:
+
+    histograms = (
+        ('duration', 'blogicum_request_duration_seconds',
+         'Total request processing time.'),
+        ('db_duration', 'blogicum_db_duration_seconds',
+         'Time spent executing SQL.'),
+        ('render_duration', 'blogicum_template_render_seconds',
+         'Time spent rendering template responses.'),
+        ('queries', 'blogicum_db_queries',
+         'SQL queries per request.'),
+    )
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def record(self, view, stats, duration):
+        with self.lock:
+            metrics = self.views.setdefault(view, ViewMetrics())
+            metrics.duration.observe(duration)
+            metrics.db_duration.observe(stats.db_time)
+            metrics.render_duration.observe(stats.render_time)
+            metrics.queries.observe(stats.queries)
+
+    def render(self):
+        lines = []
+        with self.lock:
+            views = sorted(self.views.items())
+            lines.append(
+                '# HELP blogicum_requests_total Requests handled per view.'
+            )
+            lines.append('# TYPE blogicum_requests_total counter')
+            for view, metrics in views:
+                lines.append(
+                    f'blogicum_requests_total{{view="{view}"}} '
+                    f'{sum(metrics.duration.counts)}'
+                )
+            for attr, name, help_text in self.histograms:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for view, metrics in views:
+                    lines.extend(
+                        getattr(metrics, attr).render(name, f'view="{view}"')
+                    )
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class RequestStats:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.sql = []
+
+
+def record_query(execute, sql, params, many, context):
+    """``execute_wrapper`` hook that times SQL of the current request."""
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        with stats.lock:
+            stats.queries += 1
+            stats.db_time += duration
+            if len(stats.sql) < settings.SLOW_REQUEST_MAX_QUERIES:
+                stats.sql.append((duration, sql))
+
+
+@contextmanager
+def record_queries():
+    """
+    Times SQL of the current request on this thread's connections.
+
+    Connections are per thread, so code that the request hands over to
+    worker threads, like the asynchronous views, has to enter it there too.
+    """
+    with ExitStack() as stack:
+        if _request_stats.get() is not None:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(record_query))
+        yield
+
+
+def view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unresolved>'
+    view = getattr(match.func, 'view_class', match.func)
+    return f'{view.__module__}.{view.__qualname__}'
+
+
+class MetricsMiddleware:
+    """
+    Records SQL, template rendering and total time of every request.
+
+    Should be the first middleware so that it measures the whole chain and
+    renders template responses after every other middleware has seen them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            with record_queries():
+                response = self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        duration = time.perf_counter() - started
+        view = view_label(request)
+        registry.record(view, stats, duration)
+        if duration >= settings.SLOW_REQUEST_THRESHOLD:
+            self.log_slow_request(request, view, stats, duration)
+        return response
+
+    def process_template_response(self, request, response):
+        stats = _request_stats.get()
+        if stats is not None:
+            started = time.perf_counter()
+            response.render()
+            stats.render_time += time.perf_counter() - started
+        return response
+
+    def log_slow_request(self, request, view, stats, duration):
+        queries = '\n'.join(
+            f'  {query_time * 1000:.1f} ms: {sql}'
+            for query_time, sql in sorted(stats.sql, reverse=True)
+        )
+        logger.warning(
+            'Slow request %s %s (%s): %.1f ms total, %d queries in %.1f ms, '
+            'render %.1f ms\n%s',
+            request.method, request.path, view, duration * 1000,
+            stats.queries, stats.db_time * 1000, stats.render_time * 1000,
+            queries
+        )
+
+
+def is_metrics_client(request):
+    """Checks the bearer token if one is set, otherwise the client address."""
+    if settings.METRICS_TOKEN:
+        return constant_time_compare(
+            request.META.get('HTTP_AUTHORIZATION', ''),
+            f'Bearer {settings.METRICS_TOKEN}'
+        )
+    return request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+
+
+def metrics_view(request):
+    """Exposes the collected metrics in the Prometheus text format."""
+    if not settings.METRICS_ENABLED or not is_metrics_client(request):
+        raise Http404
+    return HttpResponse(
+        registry.render(), content_type='text/plain; version=0.0.4'
+    )
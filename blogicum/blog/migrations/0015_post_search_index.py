@@ -0,0 +1,71 @@
+from django.db import migrations
+
+CREATE_TABLE_SQL = """
+    CREATE VIRTUAL TABLE blog_post_fts USING fts5(
+        title, text,
+        content='blog_post', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+"""
+
+# SQLite drops these with blog_post, so migrations that rebuild the table
+# have to create them again.
+TRIGGERS_SQL = (
+    """
+    CREATE TRIGGER blog_post_fts_insert AFTER INSERT ON blog_post BEGIN
+        INSERT INTO blog_post_fts(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER blog_post_fts_delete AFTER DELETE ON blog_post BEGIN
+        INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER blog_post_fts_update AFTER UPDATE OF title, text
+    ON blog_post BEGIN
+        INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO blog_post_fts(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+)
+
+DROP_TRIGGERS_SQL = (
+    'DROP TRIGGER IF EXISTS blog_post_fts_update',
+    'DROP TRIGGER IF EXISTS blog_post_fts_delete',
+    'DROP TRIGGER IF EXISTS blog_post_fts_insert',
+)
+
+REBUILD_SQL = "INSERT INTO blog_post_fts(blog_post_fts) VALUES ('rebuild')"
+
+CREATE_SQL = (CREATE_TABLE_SQL, *TRIGGERS_SQL, REBUILD_SQL)
+
+DROP_SQL = (*DROP_TRIGGERS_SQL, 'DROP TABLE IF EXISTS blog_post_fts')
+
+# Recreates the triggers after blog_post was rebuilt and reindexes the
+# rows changed in between.
+RESTORE_SQL = (*DROP_TRIGGERS_SQL, *TRIGGERS_SQL, REBUILD_SQL)
+
+
+def run_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sqlite(CREATE_SQL), run_sqlite(DROP_SQL)),
+    ]
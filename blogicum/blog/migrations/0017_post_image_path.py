@@ -0,0 +1,28 @@
+# Generated by Django 3.2.16 on 2026-10-17 01:18
+
+from importlib import import_module
+
+import blog.models
+from django.db import migrations, models
+
+search_index = import_module('blog.migrations.0015_post_search_index')
+restore_search_index = search_index.run_sqlite(search_index.RESTORE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_follow_timeline'),
+    ]
+
+    # AlterField rebuilds blog_post on SQLite, which drops the triggers that
+    # keep blog_post_fts in sync, in either direction.
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_search_index),
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, upload_to=blog.models.post_image_path, verbose_name='Изображение'),
+        ),
+        migrations.RunPython(restore_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-17 01:25
+
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import F
+
+search_index = import_module('blog.migrations.0015_post_search_index')
+restore_search_index = search_index.run_sqlite(search_index.RESTORE_SQL)
+
+
+def fill_updated_at(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_post_image_path'),
+    ]
+
+    # AddField rebuilds blog_post on SQLite, which drops the triggers that
+    # keep blog_post_fts in sync, in either direction.
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_search_index),
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Изменено'),
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+        migrations.RunPython(restore_search_index, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,46 @@
+import os
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from django.utils import timezone
+
+from .catalog import PostQuerySet
 
 
 User = get_user_model()
 
+_deleting_posts = ContextVar('deleting_posts', default=frozenset())
+
+
+@contextmanager
+def deleting_posts(pks):
+    """Marks the posts as being deleted for the duration of the block."""
+    token = _deleting_posts.set(_deleting_posts.get() | set(pks))
+    try:
+        yield
+    finally:
+        _deleting_posts.reset(token)
+
+
+def is_being_deleted(post_id):
+    """Tells whether the post is deleted right now, with its comments."""
+    return post_id in _deleting_posts.get()
+
+
+def post_image_path(instance, filename):
+    """
+    Returns a unique storage name for an uploaded post image.
+
+    A new upload never reuses an existing name, so served images can be
+    cached as immutable.
+    """
+    _, extension = os.path.splitext(filename)
+    return f'posts_images/{uuid.uuid4().hex}{extension.lower()}'
+
 
 class BaseModel(models.Model):
     """Abstract model. Adds publication and creation flags to the model."""
@@ -105,18 +141,49 @@ class Post(BaseModel):
     )
     image = models.ImageField(
         'Изображение',
-        upload_to='posts_images',
+        upload_to=post_image_path,
         blank=True
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено'
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=models.Q(is_published=True),
+                name='post_feed_idx'
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=models.Q(is_published=True),
+                name='post_category_feed_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx'
+            ),
+        )
 
     def __str__(self) -> str:
         return self.title
 
+    def delete(self, *args, **kwargs):
+        with deleting_posts((self.pk,)):
+            return super().delete(*args, **kwargs)
+
 
 class Comment(models.Model):
     """Post's Comment model."""
@@ -145,6 +212,169 @@ class Comment(models.Model):
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
         ordering = ('creation_date',)
+        indexes = (
+            models.Index(
+                fields=('post', 'creation_date', 'id'),
+                name='comment_post_date_idx'
+            ),
+        )
 
     def __str__(self) -> str:
         return self.text
+
+
+class Job(models.Model):
+    """Background job model. Jobs are executed by ``manage.py run_jobs``."""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(
+        max_length=settings.MAX_LENGTH,
+        verbose_name='Задача'
+    )
+    payload = models.JSONField(
+        default=dict,
+        verbose_name='Аргументы'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Запустить после'
+    )
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Взята в работу'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('run_after',)
+        indexes = (
+            models.Index(
+                fields=('status', 'run_after'),
+                name='job_status_run_after_idx'
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.name} ({self.get_status_display()})'
+
+
+class Follow(models.Model):
+    """Subscription of a user to an author's posts."""
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following',
+        verbose_name='Подписчик'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='followers',
+        verbose_name='Автор'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+
+    class Meta:
+        verbose_name = 'подписка'
+        verbose_name_plural = 'Подписки'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'author'),
+                name='follow_unique'
+            ),
+            models.CheckConstraint(
+                check=~models.Q(user=models.F('author')),
+                name='follow_not_self'
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.user} → {self.author}'
+
+
+class TimelineEntry(models.Model):
+    """
+    Post pushed into a follower's home timeline when it is published.
+
+    ``pub_date`` and ``author`` are copied from the post, so the home feed
+    of a user is read with a single range scan of ``timeline_user_idx``.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='timeline',
+        verbose_name='Подписчик'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+        verbose_name='Публикация'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Автор публикации'
+    )
+    pub_date = models.DateTimeField(
+        verbose_name='Дата и время публикации'
+    )
+
+    class Meta:
+        verbose_name = 'запись ленты подписок'
+        verbose_name_plural = 'Ленты подписок'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'post'),
+                name='timeline_unique'
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('user', '-pub_date', '-post'),
+                name='timeline_user_idx'
+            ),
+            models.Index(
+                fields=('user', 'author'),
+                name='timeline_user_author_idx'
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.user}: {self.post}'
@@ -0,0 +1,154 @@
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .cache import count_cache_key, page_cache_timeout
+
+
+class InvalidCursor(Exception):
+    """Raised when a cursor token can't be decoded."""
+
+
+class CursorPage:
+    """A page of objects fetched by a keyset (cursor) query."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset paginator over ``(field, id)``, newest first by default.
+
+    Pages are fetched with a ``WHERE (field, id) < (...)`` predicate
+    instead of OFFSET, so every page costs the same and no COUNT(*) is run.
+    Cursors are signed opaque tokens.
+    """
+
+    salt = 'blog.paginators.cursor'
+    field = 'pub_date'
+    descending = True
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+
+    def encode_cursor(self, obj, backwards=False):
+        return signing.dumps(
+            [getattr(obj, self.field).isoformat(), obj.pk, backwards],
+            salt=self.salt, compress=True
+        )
+
+    def decode_cursor(self, token):
+        try:
+            value, pk, backwards = signing.loads(token, salt=self.salt)
+        except (signing.BadSignature, TypeError, ValueError):
+            raise InvalidCursor(token)
+        return value, pk, bool(backwards)
+
+    def ordering(self, descending):
+        prefix = '-' if descending else ''
+        return f'{prefix}{self.field}', f'{prefix}pk'
+
+    def after(self, value, pk, descending):
+        lookup = 'lt' if descending else 'gt'
+        return (
+            Q(**{f'{self.field}__{lookup}': value})
+            | Q(**{self.field: value, f'pk__{lookup}': pk})
+        )
+
+    def page(self, token=None):
+        """
+        Returns the page after the cursor ``token``.
+
+        A missing or malformed cursor, e.g. a truncated link, gives the
+        first page.
+        """
+        queryset = self.queryset
+        backwards = False
+        descending = self.descending
+        if token:
+            try:
+                value, pk, backwards = self.decode_cursor(token)
+            except InvalidCursor:
+                token = None
+        if token:
+            if backwards:
+                descending = not descending
+            queryset = queryset.filter(self.after(value, pk, descending))
+        queryset = queryset.order_by(*self.ordering(descending))
+
+        objects = list(queryset[:self.per_page + 1])
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+        if backwards:
+            objects.reverse()
+
+        next_cursor = previous_cursor = None
+        if objects:
+            if has_more or backwards:
+                next_cursor = self.encode_cursor(objects[-1])
+            if token and (has_more or not backwards):
+                previous_cursor = self.encode_cursor(
+                    objects[0], backwards=True
+                )
+        return CursorPage(objects, next_cursor, previous_cursor)
+
+
+class CommentCursorPaginator(CursorPaginator):
+    """Keyset paginator over ``(creation_date, id)``, oldest first."""
+
+    salt = 'blog.paginators.comment_cursor'
+    field = 'creation_date'
+    descending = False
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that keeps the object count in the cache.
+
+    The count of a feed (``count_key``) is computed once and reused until a
+    post or category changes or the next scheduled post is published.
+    Without a key the count is exact, as in Django's ``Paginator``.
+    """
+
+    def __init__(self, object_list, per_page, count_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return super().count
+        key = count_cache_key(self.count_key)
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, page_cache_timeout())
+        return count
+
+    def get_page_range(self, number):
+        """Returns first, last and neighbouring pages with ellipses."""
+        return self.get_elided_page_range(
+            number, on_each_side=settings.PAGINATION_ON_EACH_SIDE, on_ends=1
+        )
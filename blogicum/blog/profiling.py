@@ -0,0 +1,169 @@
+import cProfile
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core import signing
+
+from .metrics import view_label
+
+PROFILE_HEADER = 'HTTP_X_BLOGICUM_PROFILE'
+TOKEN_SALT = 'blog.profiling'
+TOKEN_VALUE = 'profile'
+
+_lock = threading.Lock()
+_sampler = ContextVar('blog_profiling_sampler', default=None)
+
+
+def make_token():
+    """Returns a signed value for the ``X-Blogicum-Profile`` header."""
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(TOKEN_VALUE)
+
+
+def has_valid_token(request):
+    token = request.META.get(PROFILE_HEADER)
+    if not token:
+        return False
+    try:
+        value = signing.TimestampSigner(salt=TOKEN_SALT).unsign(
+            token, max_age=settings.PROFILING_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return value == TOKEN_VALUE
+
+
+def should_profile(request):
+    return (
+        has_valid_token(request)
+        or random.random() < settings.PROFILING_SAMPLE_RATE
+    )
+
+
+class StackSampler:
+    """
+    Samples the stacks of the request's threads at a fixed interval.
+
+    Stacks are counted in the collapsed format understood by flamegraph
+    tools: ``outer;inner;innermost <count>``.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_ids = {thread_id}
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in tuple(self.thread_ids):
+                self.sample(frames.get(thread_id))
+
+    def sample(self, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(
+                f'{frame.f_globals.get("__name__", "?")}:{code.co_name}'
+            )
+            frame = frame.f_back
+        if stack:
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def dump(self, path):
+        with open(path, 'w') as output:
+            for stack, count in self.stacks.items():
+                output.write(f'{stack} {count}\n')
+
+
+@contextmanager
+def sample_thread():
+    """Lets the stack sampler of the current request follow this thread."""
+    sampler = _sampler.get()
+    if sampler is None:
+        yield
+        return
+    thread_id = threading.get_ident()
+    sampler.thread_ids.add(thread_id)
+    try:
+        yield
+    finally:
+        sampler.thread_ids.discard(thread_id)
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a sample of requests and spools the results to disk.
+
+    A request is profiled with probability ``PROFILING_SAMPLE_RATE`` or when
+    it carries a valid signed ``X-Blogicum-Profile`` header. Depending on
+    ``PROFILING_MODE`` it runs under cProfile (``.prof`` files) or a stack
+    sampler (``.collapsed`` files). Only one request per process is profiled
+    at a time, as profilers can't be nested.
+
+    cProfile only sees the thread running the middleware. The sampler also
+    follows the worker threads that asynchronous views run queries in, so
+    it is the mode to use with ``ASYNC_VIEWS``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.PROFILING_ENABLED or not should_profile(request):
+            return self.get_response(request)
+        if not _lock.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            if settings.PROFILING_MODE == 'sampler':
+                return self.sample(request)
+            return self.profile(request)
+        finally:
+            _lock.release()
+
+    def spool_path(self, request, extension):
+        os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+        view = view_label(request).replace('<', '').replace('>', '')
+        return os.path.join(
+            settings.PROFILING_DIR,
+            f'{time.time_ns()}-{os.getpid()}-{view}.{extension}'
+        )
+
+    def profile(self, request):
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        profiler.dump_stats(self.spool_path(request, 'prof'))
+        return response
+
+    def sample(self, request):
+        sampler = StackSampler(
+            threading.get_ident(), settings.PROFILING_INTERVAL
+        )
+        token = _sampler.set(sampler)
+        sampler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            sampler.stop()
+            _sampler.reset(token)
+        sampler.dump(self.spool_path(request, 'collapsed'))
+        return response
@@ -0,0 +1,53 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Post
+
+FTS_TABLE = 'blog_post_fts'
+FTS_TRIGGERS = (
+    'blog_post_fts_insert', 'blog_post_fts_delete', 'blog_post_fts_update'
+)
+WORD = re.compile(r'\w+')
+
+
+def fts_query(query):
+    """
+    Turns user input into a safe FTS5 query.
+
+    Every word is quoted (so FTS5 operators in the input are ignored) and
+    matched as a prefix; all words must be present.
+    """
+    return ' '.join(f'"{word}"*' for word in WORD.findall(query))
+
+
+def search_posts(queryset, query):
+    """
+    Filters the queryset by a full-text query, best matches first.
+
+    On SQLite the FTS5 index maintained by triggers on ``blog_post`` is
+    used; other databases fall back to a case-insensitive scan.
+    """
+    match = fts_query(query)
+    if not match:
+        return queryset.none()
+    if connections[queryset.db].vendor != 'sqlite':
+        condition = Q()
+        for word in WORD.findall(query):
+            condition &= Q(title__icontains=word) | Q(text__icontains=word)
+        return queryset.filter(condition)
+    table = Post._meta.db_table
+    return queryset.filter(
+        pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (match,)
+        )
+    ).annotate(
+        rank=RawSQL(
+            f'SELECT bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE}.rowid = {table}.id AND {FTS_TABLE} MATCH %s',
+            (match,)
+        )
+    ).order_by('rank', '-pub_date')
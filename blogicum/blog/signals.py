@@ -0,0 +1,151 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import timeline
+from .cache import bump_version
+from .images import renditions_exist
+from .jobs import enqueue
+from .models import (Category, Comment, Follow, Location, Post, User,
+                     is_being_deleted)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    """Increments the post's comment counter when a comment is created."""
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    """
+    Decrements the post's comment counter when a comment is deleted.
+
+    Comments deleted along with their post are skipped, so a cascade
+    doesn't update the row once per comment right before deleting it.
+    """
+    if is_being_deleted(instance.post_id):
+        return
+    Post.objects.filter(
+        pk=instance.post_id, comment_count__gt=0
+    ).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+@receiver(post_save, sender=Post)
+def create_image_renditions(sender, instance, raw=False, **kwargs):
+    """Enqueues generation of missing renditions of the post image."""
+    image = instance.image
+    if image and not raw and not renditions_exist(image.name, image.storage):
+        enqueue('process_post_image', post_id=instance.pk, name=image.name)
+
+
+@receiver(post_save, sender=Post)
+def fan_out_post(sender, instance, raw=False, **kwargs):
+    """
+    Enqueues pushing the post into the followers' home timelines.
+
+    Without followers there are neither timelines to fill nor entries to
+    update, so no job is queued.
+    """
+    if not raw and timeline.followers_count(instance.author_id):
+        enqueue('fan_out_post', post_id=instance.pk)
+
+
+@receiver(post_save, sender=Follow)
+def follow_author(sender, instance, created, raw=False, **kwargs):
+    """Fills the follower's timeline with the author's latest posts."""
+    if created and not raw:
+        cache.delete(timeline.followers_key(instance.author_id))
+        timeline.backfill(instance.user_id, instance.author_id)
+
+
+@receiver(post_delete, sender=Follow)
+def unfollow_author(sender, instance, **kwargs):
+    """
+    Removes the author's posts from the former follower's timeline.
+
+    When the author drops back under the fan-out limit, their recent posts
+    are pushed to the remaining followers, who read them on demand so far.
+    """
+    cache.delete(timeline.followers_key(instance.author_id))
+    timeline.remove(instance.user_id, instance.author_id)
+    if timeline.followers_count(
+        instance.author_id
+    ) == settings.TIMELINE_FANOUT_LIMIT:
+        enqueue('fan_out_author', author_id=instance.author_id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    """Invalidates cached fragments and counts of the post."""
+    bump_version('post', instance.pk)
+    bump_version('counts', 'all')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_post(sender, instance, **kwargs):
+    """Invalidates cached fragments of the commented post."""
+    bump_version('post', instance.post_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category(sender, instance, **kwargs):
+    """Invalidates cached fragments of posts in the category."""
+    bump_version('category', instance.pk)
+    bump_version('catalog', 'all')
+    bump_version('counts', 'all')
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location(sender, instance, **kwargs):
+    """Invalidates cached fragments of posts in the location."""
+    bump_version('location', instance.pk)
+    bump_version('catalog', 'all')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    """Invalidates cached fragments of posts by the user."""
+    bump_version('user', instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_feeds(sender, update_fields=None, **kwargs):
+    """
+    Invalidates every cached syndication feed.
+
+    Logins only update ``last_login``, which feeds don't show.
+    """
+    if sender is User and update_fields == {'last_login'}:
+        return
+    bump_version('feeds', 'all')
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_pages(sender, **kwargs):
+    """Invalidates every cached feed page."""
+    bump_version('pages', 'all')
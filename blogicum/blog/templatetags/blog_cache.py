@@ -0,0 +1,20 @@
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from blog.cache import post_card_key
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card(post):
+    """Renders ``includes/post_card.html`` through the fragment cache."""
+    key = post_card_key(post)
+    html = cache.get(key)
+    if html is None:
+        html = get_template('includes/post_card.html').render({'post': post})
+        cache.set(key, html, settings.POST_CARD_CACHE_TIMEOUT)
+    return mark_safe(html)
@@ -0,0 +1,23 @@
+from django import template
+
+from blog import catalog
+
+register = template.Library()
+
+
+@register.simple_tag
+def published_categories():
+    """Returns published categories without querying the database."""
+    return catalog.published_categories()
+
+
+@register.simple_tag
+def published_locations():
+    """Returns published locations without querying the database."""
+    return sorted(
+        (
+            location for location in catalog.locations().values()
+            if location.is_published
+        ),
+        key=lambda location: location.name
+    )
@@ -0,0 +1,47 @@
+from django import template
+from django.conf import settings
+
+from blog.images import rendition_name, renditions_exist, srcset
+from blog.jobs import active_payloads
+
+register = template.Library()
+
+
+def processing_images(context):
+    """
+    Returns names of images that still have a rendition job queued.
+
+    The jobs are looked up once per rendered page, not once per card.
+    """
+    if 'processing_images' not in context.render_context:
+        context.render_context['processing_images'] = {
+            payload['name']
+            for payload in active_payloads('process_post_image')
+        }
+    return context.render_context['processing_images']
+
+
+@register.inclusion_tag('includes/post_image.html', takes_context=True)
+def post_image(context, post, rendition='feed'):
+    """
+    Renders the post image as a responsive ``<picture>``.
+
+    Until the background job has written the renditions a placeholder is
+    shown instead of the full-size original. Without a queued job, e.g. for
+    images uploaded before renditions existed or when the job has failed,
+    the original is shown.
+    """
+    name = post.image.name
+    if not renditions_exist(name, post.image.storage):
+        if name in processing_images(context):
+            return {'post': post, 'processing': True}
+        return {'post': post, 'original': True}
+    return {
+        'post': post,
+        'src': post.image.storage.url(
+            rendition_name(name, rendition, 'jpg')
+        ),
+        'srcset': srcset(name, 'jpg', post.image.storage),
+        'webp_srcset': srcset(name, 'webp', post.image.storage),
+        'sizes': settings.POST_IMAGE_SIZES,
+    }
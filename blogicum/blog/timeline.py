@@ -0,0 +1,164 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from . import catalog, clock
+from .models import Follow, Post, TimelineEntry
+
+FOLLOWERS_KEY = 'blog:followers:{pk}'
+
+
+def followers_key(author_id):
+    return FOLLOWERS_KEY.format(pk=author_id)
+
+
+def followers_counts(author_ids):
+    """Returns the cached follower counts of the authors by id."""
+    keys = {followers_key(pk): pk for pk in author_ids}
+    counts = {
+        keys[key]: count for key, count in cache.get_many(keys).items()
+    }
+    missing = [pk for pk in author_ids if pk not in counts]
+    if missing:
+        fetched = dict.fromkeys(missing, 0)
+        fetched.update(
+            Follow.objects.filter(author_id__in=missing).values(
+                'author_id'
+            ).annotate(count=Count('id')).values_list('author_id', 'count')
+        )
+        cache.set_many(
+            {followers_key(pk): count for pk, count in fetched.items()}, None
+        )
+        counts.update(fetched)
+    return counts
+
+
+def followers_count(author_id):
+    return followers_counts([author_id])[author_id]
+
+
+def is_fanned_out(author_id):
+    """
+    Tells whether the author's posts are pushed into follower timelines.
+
+    Posts of authors with more than ``TIMELINE_FANOUT_LIMIT`` followers are
+    not copied on write; home feeds read them from the author index instead.
+    """
+    return followers_count(author_id) <= settings.TIMELINE_FANOUT_LIMIT
+
+
+def timeline_entries(posts, user_ids):
+    for post in posts:
+        for user_id in user_ids:
+            yield TimelineEntry(
+                user_id=user_id,
+                post_id=post.pk,
+                author_id=post.author_id,
+                pub_date=post.pub_date
+            )
+
+
+def fan_out(post_id):
+    """
+    Pushes the post into the timelines of the author's followers.
+
+    Entries keep the post's ``pub_date``, so deferred posts are written
+    ahead and show up in home feeds once their publication time comes.
+    """
+    post = Post.objects.filter(pk=post_id).first()
+    if post is None:
+        return
+    entries = TimelineEntry.objects.filter(post_id=post_id)
+    if not post.is_published or not is_fanned_out(post.author_id):
+        entries.delete()
+        return
+    entries.update(pub_date=post.pub_date)
+    followers = Follow.objects.filter(
+        author_id=post.author_id
+    ).values_list('user_id', flat=True)
+    TimelineEntry.objects.bulk_create(
+        timeline_entries([post], followers.iterator()),
+        batch_size=settings.TIMELINE_BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+def backfill(user_id, author_id):
+    """Copies the author's latest posts into the follower's timeline."""
+    if not is_fanned_out(author_id):
+        return
+    posts = Post.objects.filter(
+        author_id=author_id, is_published=True
+    ).order_by('-pub_date').only(
+        'pk', 'author_id', 'pub_date'
+    )[:settings.TIMELINE_BACKFILL]
+    TimelineEntry.objects.bulk_create(
+        timeline_entries(posts, [user_id]),
+        batch_size=settings.TIMELINE_BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+def remove(user_id, author_id):
+    """Removes the author's posts from the follower's timeline."""
+    TimelineEntry.objects.filter(user_id=user_id, author_id=author_id).delete()
+
+
+def pulled_authors(user):
+    """Returns followed authors whose posts are read on demand."""
+    author_ids = list(
+        Follow.objects.filter(user=user).values_list('author_id', flat=True)
+    )
+    return [
+        pk for pk, count in followers_counts(author_ids).items()
+        if count > settings.TIMELINE_FANOUT_LIMIT
+    ]
+
+
+class HomeTimeline:
+    """
+    Home feed of a user, sliceable and countable for ``Paginator``.
+
+    Post ids are read in order from the user's timeline entries, merged
+    with the latest posts of followed authors that are not fanned out, and
+    the page is then loaded from ``posts``. Entries of hidden posts and of
+    posts in unpublished categories are filtered out before counting and
+    slicing, so pages stay full and the count matches what is shown.
+    """
+
+    def __init__(self, user, posts):
+        self.posts = posts
+        now = clock.now()
+        hidden_categories = catalog.unpublished_category_ids()
+        entries = TimelineEntry.objects.filter(
+            user=user,
+            pub_date__lte=now,
+            post__is_published=True,
+            post__category__isnull=False,
+        ).exclude(
+            post__category_id__in=hidden_categories
+        ).values_list('post_id', 'pub_date')
+        authors = pulled_authors(user)
+        if authors:
+            entries = entries.union(
+                Post.objects.filter(
+                    author_id__in=authors,
+                    is_published=True,
+                    pub_date__lte=now,
+                    category__isnull=False,
+                ).exclude(
+                    category_id__in=hidden_categories
+                ).order_by().values_list('pk', 'pub_date')
+            )
+        self.entries = entries.order_by('-pub_date', '-post_id')
+
+    def count(self):
+        return self.entries.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        ids = [pk for pk, _ in self.entries[key]]
+        posts = self.posts.in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
@@ -1,16 +1,55 @@
+from django.conf import settings
 from django.urls import path
 
-from blog import views
+from blog import async_views, views
+from blogicum.routers import replica_reads
 
 app_name = 'blog'
 
+if settings.ASYNC_VIEWS:
+    index_view = async_views.post_list
+    category_posts_view = async_views.category_posts
+    profile_view = async_views.profile
+    post_detail_view = async_views.post_detail
+else:
+    index_view = views.PostListView.as_view()
+    category_posts_view = views.CategoryPostsView.as_view()
+    profile_view = views.Profile.as_view()
+    post_detail_view = views.PostDetailView.as_view()
+
+# Anonymous GETs of these views may read blog content from a replica.
+index_view = replica_reads(index_view)
+category_posts_view = replica_reads(category_posts_view)
+profile_view = replica_reads(profile_view)
+post_detail_view = replica_reads(post_detail_view)
+
 urlpatterns = [
     path(
-        '', views.PostListView.as_view(), name='index'
+        '', index_view, name='index'
+    ),
+    path(
+        'search/',
+        views.SearchView.as_view(), name='search'
+    ),
+    path(
+        'feed/',
+        views.FeedView.as_view(), name='feed'
+    ),
+    path(
+        'feeds/<slug:feed_format>/',
+        replica_reads(views.PostsFeedView.as_view()), name='posts_feed'
+    ),
+    path(
+        'feeds/category/<slug:category_slug>/<slug:feed_format>/',
+        replica_reads(views.CategoryFeedView.as_view()), name='category_feed'
+    ),
+    path(
+        'feeds/profile/<str:username>/<slug:feed_format>/',
+        replica_reads(views.AuthorFeedView.as_view()), name='author_feed'
     ),
     path(
         '<slug:category_slug>/',
-        views.CategoryPostsView.as_view(), name='category_posts'
+        category_posts_view, name='category_posts'
     ),
     path(
         'profile/edit',
@@ -18,12 +57,24 @@ urlpatterns = [
     ),
     path(
         'profile/<str:username>/',
-        views.Profile.as_view(), name='profile'
+        profile_view, name='profile'
+    ),
+    path(
+        'profile/<str:username>/follow/',
+        views.FollowView.as_view(), name='follow'
+    ),
+    path(
+        'profile/<str:username>/unfollow/',
+        views.UnfollowView.as_view(), name='unfollow'
     ),
     path(
         'posts/<int:post_id>/comment/',
         views.CommentCreateView.as_view(), name='add_comment'
     ),
+    path(
+        'posts/<int:post_id>/comments/',
+        replica_reads(views.CommentListView.as_view()), name='comments'
+    ),
     path(
         'posts/<int:post_id>/edit_comment/<int:comment_id>/',
         views.CommentEditView.as_view(), name='edit_comment'
@@ -46,6 +97,6 @@ urlpatterns = [
     ),
     path(
         'posts/<int:post_id>/',
-        views.PostDetailView.as_view(), name='post_detail'
+        post_detail_view, name='post_detail'
     ),
 ]
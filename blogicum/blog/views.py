@@ -1,36 +1,139 @@
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
-from django.http import Http404
+from django.db.models import Exists, OuterRef
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
+from django.template.loader import render_to_string
 from django.urls import reverse
-from django.utils import timezone
+from django.utils.http import urlencode
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
-                                  UpdateView)
+                                  UpdateView, View)
 
+from . import catalog, clock, timeline
+from .cache import (cache_page, get_cached_page, is_page_cacheable,
+                    page_cache_key)
+from .feeds import GENERATORS, feed_response
 from .forms import CommentForm, PostForm, UserForm
-from .models import Category, Comment, Post, User
+from .models import Category, Comment, Follow, Post, User
+from .paginators import (CachedCountPaginator, CommentCursorPaginator,
+                         CursorPaginator)
+from .search import search_posts
 
 
 def filtering(posts):
     """Функция для устранения повторяющегося кода."""
-    return posts.select_related(
-        'category', 'location', 'author'
-    ).filter(
-        pub_date__lte=timezone.now(),
-        category__is_published=True,
+    # IN по опубликованным категориям заставляет SQLite читать индекс по
+    # каждой из них и сортировать результат. Подзапрос по первичному ключу
+    # категории оставляет ленту на post_feed_idx в порядке pub_date и, в
+    # отличие от списка из каталога, сразу видит новые скрытые категории.
+    return posts.select_related('author').filter(
+        Exists(Category.objects.filter(
+            pk=OuterRef('category_id'), is_published=True
+        )),
+        pub_date__lte=clock.now(),
         is_published=True,
-    ).annotate(
-        comment_count=Count('comments')
-    ).order_by('-pub_date')
+    ).with_catalog().order_by('-pub_date')
 
 
-class Profile(ListView):
+def check_post_visibility(post, user):
+    """Скрываем от всех, кроме автора, неопубликованные посты."""
+    if (
+        not post.category.is_published
+        or post.pub_date > clock.now()
+        or not post.is_published
+    ) and post.author != user:
+        raise Http404('Пост не найден.')
+
+
+def get_comments_page(request, post_id):
+    """Получаем страницу комментариев поста вместе с их авторами."""
+    paginator = CommentCursorPaginator(
+        Comment.objects.filter(post_id=post_id).select_related('author'),
+        settings.COMMENT_PAGINATION
+    )
+    return paginator.page(request.GET.get('cursor'))
+
+
+def get_follow_context(user, author):
+    """Получаем число подписчиков автора и подписку пользователя на него."""
+    return {
+        'followers_count': timeline.followers_count(author.pk),
+        'is_following': user.is_authenticated and Follow.objects.filter(
+            user=user, author=author
+        ).exists(),
+    }
+
+
+class CursorPaginationMixin:
+    """Миксин для постраничного вывода по курсору (pub_date, id)."""
+
+    cursor_kwarg = 'cursor'
+
+    def paginate_queryset(self, queryset, page_size):
+        """Разбиваем queryset на страницы без OFFSET и COUNT(*)."""
+        if not settings.POST_CURSOR_PAGINATION:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        """Получаем контекст."""
+        context = super().get_context_data(**kwargs)
+        context['cursor_pagination'] = settings.POST_CURSOR_PAGINATION
+        return context
+
+
+class CachedCountMixin:
+    """Миксин для постраничного вывода с кэшированным числом постов."""
+
+    paginator_class = CachedCountPaginator
+
+    def get_count_key(self):
+        """Ключ счётчика постов; None — считать точно."""
+        return None
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        """Получаем paginator с ключом счётчика."""
+        return super().get_paginator(
+            queryset, per_page, count_key=self.get_count_key(), **kwargs
+        )
+
+    def get_context_data(self, **kwargs):
+        """Получаем контекст с укороченным списком страниц."""
+        context = super().get_context_data(**kwargs)
+        paginator = context.get('paginator')
+        if isinstance(paginator, CachedCountPaginator):
+            context['page_range'] = paginator.get_page_range(
+                context['page_obj'].number
+            )
+        return context
+
+
+class AnonymousPageCacheMixin:
+    """Миксин полного кэширования страниц для анонимных пользователей."""
+
+    def dispatch(self, request, *args, **kwargs):
+        """Отдаём страницу из кэша или кэшируем отрендеренный ответ."""
+        if not is_page_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = page_cache_key(request.get_full_path())
+        response = get_cached_page(request, key)
+        if response is None:
+            response = cache_page(
+                request, super().dispatch(request, *args, **kwargs), key
+            )
+        return response
+
+
+class Profile(CachedCountMixin, CursorPaginationMixin, ListView):
     """View класс для отображения списка постов определённого автора."""
 
     template_name = 'blog/profile.html'
     paginate_by = settings.POST_PAGINATION
     author = None
+    is_owner = False
 
     def get_queryset(self):
         """Получаем список постов автора."""
@@ -38,11 +141,11 @@ class Profile(ListView):
             User,
             username=self.kwargs['username']
         )
-        if self.author == self.request.user:
-            queryset = self.author.posts.annotate(
-                comment_count=Count('comments')
-            ).order_by('-pub_date')
-            return queryset
+        self.is_owner = self.author == self.request.user
+        if self.is_owner:
+            return self.author.posts.select_related(
+                'author'
+            ).with_catalog().order_by('-pub_date')
 
         return filtering(self.author.posts)
 
@@ -50,8 +153,15 @@ class Profile(ListView):
         """Получаем контекст."""
         context = super().get_context_data(**kwargs)
         context['profile'] = self.author
+        context.update(get_follow_context(self.request.user, self.author))
         return context
 
+    def get_count_key(self):
+        """Ключ счётчика постов автора."""
+        if self.is_owner:
+            return f'author:{self.author.pk}:all'
+        return f'author:{self.author.pk}'
+
 
 class ProfieEditView(LoginRequiredMixin, UpdateView):
     """View класс для редактирования профиля пользователя."""
@@ -72,13 +182,56 @@ class ProfieEditView(LoginRequiredMixin, UpdateView):
         )
 
 
-class PostListView(ListView):
+class PostListView(AnonymousPageCacheMixin, CachedCountMixin,
+                   CursorPaginationMixin, ListView):
     """View класс для отображения списка постов на главной странице."""
 
     template_name = 'blog/index.html'
     model = Post
     paginate_by = settings.POST_PAGINATION
-    queryset = filtering(Post.objects)
+
+    def get_queryset(self):
+        """Получаем опубликованные посты на момент запроса."""
+        return filtering(Post.objects)
+
+    def get_count_key(self):
+        """Ключ счётчика постов ленты."""
+        return 'feed'
+
+
+class FeedView(LoginRequiredMixin, CachedCountMixin, ListView):
+    """View класс для ленты подписок пользователя."""
+
+    template_name = 'blog/feed.html'
+    paginate_by = settings.POST_PAGINATION
+
+    def get_queryset(self):
+        """Получаем посты авторов, на которых подписан пользователь."""
+        return timeline.HomeTimeline(
+            self.request.user, filtering(Post.objects)
+        )
+
+
+class FollowView(LoginRequiredMixin, View):
+    """View класс для подписки на автора."""
+
+    def post(self, request, username):
+        """Подписываемся на автора."""
+        author = get_object_or_404(User, username=username)
+        if author != request.user:
+            Follow.objects.get_or_create(user=request.user, author=author)
+        return redirect('blog:profile', username=username)
+
+
+class UnfollowView(LoginRequiredMixin, View):
+    """View класс для отписки от автора."""
+
+    def post(self, request, username):
+        """Отписываемся от автора."""
+        Follow.objects.filter(
+            user=request.user, author__username=username
+        ).delete()
+        return redirect('blog:profile', username=username)
 
 
 class PostsMixin:
@@ -88,6 +241,10 @@ class PostsMixin:
     slug_field = 'id'
     slug_url_kwarg = 'post_id'
 
+    def get_queryset(self):
+        """Получаем посты одним запросом вместе со связанными объектами."""
+        return Post.objects.select_related('category', 'location', 'author')
+
 
 class PostDetailView(PostsMixin, DetailView):
     """View класс для обзора отдельного поста."""
@@ -97,24 +254,46 @@ class PostDetailView(PostsMixin, DetailView):
     def get_object(self):
         """Получаем пост."""
         post = super().get_object()
-        if (
-            not post.category.is_published
-            or post.pub_date > timezone.now()
-            or not post.is_published
-        ) and post.author != self.request.user:
-            raise Http404('Пост не найден.')
-
+        check_post_visibility(post, self.request.user)
         return post
 
+    def get_comments(self):
+        """Получаем страницу комментариев вместе с их авторами."""
+        return get_comments_page(self.request, self.object.pk)
+
     def get_context_data(self, **kwargs):
         """Получаем контекст."""
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.all()
+        context['comments'] = self.get_comments()
         return context
 
 
-class CategoryPostsView(ListView):
+class CommentListView(PostDetailView):
+    """View класс для подгрузки следующих комментариев в JSON."""
+
+    def get(self, request, *args, **kwargs):
+        """Отдаём следующую страницу комментариев."""
+        self.object = self.get_object()
+        comments = self.get_comments()
+        html = render_to_string(
+            'includes/comment_list.html',
+            {'post': self.object, 'comments': comments},
+            request
+        )
+        next_url = None
+        if comments.has_next():
+            next_url = '{}?cursor={}'.format(
+                reverse(
+                    'blog:comments', kwargs={'post_id': self.object.pk}
+                ),
+                comments.next_cursor
+            )
+        return JsonResponse({'html': html, 'next': next_url})
+
+
+class CategoryPostsView(AnonymousPageCacheMixin, CachedCountMixin,
+                        CursorPaginationMixin, ListView):
     """View класс для постов в определённой категории."""
 
     model = Post
@@ -124,11 +303,11 @@ class CategoryPostsView(ListView):
 
     def get_queryset(self):
         """Получаем посты определённой категории."""
-        self.category = get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True
+        self.category = catalog.get_published_category(
+            self.kwargs['category_slug']
         )
+        if self.category is None:
+            raise Http404('Категория не найдена.')
         return filtering(self.category.posts)
 
     def get_context_data(self, **kwargs):
@@ -137,6 +316,86 @@ class CategoryPostsView(ListView):
         context['category'] = self.category
         return context
 
+    def get_count_key(self):
+        """Ключ счётчика постов категории."""
+        return f'category:{self.category.pk}'
+
+
+class SearchView(CachedCountMixin, ListView):
+    """View класс для полнотекстового поиска по постам."""
+
+    template_name = 'blog/search.html'
+    paginate_by = settings.POST_PAGINATION
+    query = ''
+
+    def get_queryset(self):
+        """Получаем найденные опубликованные посты."""
+        self.query = self.request.GET.get('q', '').strip()
+        return search_posts(filtering(Post.objects), self.query)
+
+    def get_context_data(self, **kwargs):
+        """Получаем контекст."""
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        context['query_prefix'] = urlencode({'q': self.query}) + '&'
+        return context
+
+
+class PostsFeedView(View):
+    """View класс для RSS, Atom и JSON Feed ленты публикаций."""
+
+    def get(self, request, feed_format, **kwargs):
+        """Отдаём ленту в запрошенном формате."""
+        if feed_format not in GENERATORS:
+            raise Http404('Формат ленты не поддерживается.')
+        return feed_response(request, feed_format, self.get_feed)
+
+    def get_feed(self):
+        """Получаем заголовок, ссылку, описание и посты ленты."""
+        return {
+            'title': 'DoggyGram',
+            'link': reverse('blog:index'),
+            'description': 'Новые публикации DoggyGram',
+            'posts': filtering(Post.objects),
+        }
+
+
+class CategoryFeedView(PostsFeedView):
+    """View класс для ленты публикаций категории."""
+
+    def get_feed(self):
+        """Получаем ленту опубликованной категории."""
+        category = catalog.get_published_category(
+            self.kwargs['category_slug']
+        )
+        if category is None:
+            raise Http404('Категория не найдена.')
+        return {
+            'title': f'DoggyGram: {category.title}',
+            'link': reverse(
+                'blog:category_posts',
+                kwargs={'category_slug': category.slug}
+            ),
+            'description': category.description,
+            'posts': filtering(category.posts),
+        }
+
+
+class AuthorFeedView(PostsFeedView):
+    """View класс для ленты публикаций автора."""
+
+    def get_feed(self):
+        """Получаем ленту опубликованных постов автора."""
+        author = get_object_or_404(User, username=self.kwargs['username'])
+        return {
+            'title': f'DoggyGram: @{author.username}',
+            'link': reverse(
+                'blog:profile', kwargs={'username': author.username}
+            ),
+            'description': f'Публикации пользователя {author.username}',
+            'posts': filtering(author.posts),
+        }
+
 
 class CommentsMixin(LoginRequiredMixin):
     """Миксин для views комментария."""
@@ -177,7 +436,7 @@ class CommentEditDeleteMixin(CommentsMixin):
     def get_object(self):
         """Получаем комментарий."""
         comment = super().get_object()
-        if comment.author == self.request.user:
+        if comment.author_id == self.request.user.pk:
             return comment
         raise Http404('Комментарий не найден.')
 
@@ -224,11 +483,18 @@ class PostEditDeleteMixin(PostsMixin, LoginRequiredMixin):
     """Миксин для views создания и удаления постов."""
 
     template_name = 'blog/create.html'
+    instance = None
+
+    def get_object(self, queryset=None):
+        """Получаем пост один раз за запрос."""
+        if self.instance is None:
+            self.instance = super().get_object(queryset)
+        return self.instance
 
     def dispatch(self, request, *args, **kwargs):
         """Диспатчеризация."""
-        post = get_object_or_404(Post, pk=self.kwargs['post_id'])
-        if self.request.user != post.author:
+        post = self.get_object()
+        if self.request.user.pk != post.author_id:
             return redirect(
                 'blog:post_detail', post_id=post.pk
             )
@@ -243,10 +509,9 @@ class PostEditView(PostEditDeleteMixin, UpdateView):
 
     def get_success_url(self):
         """Получаем адрес успешного действия."""
-        post = Post.objects.get(pk=self.kwargs['post_id'])
         return reverse(
             'blog:post_detail',
-            kwargs={'post_id': post.pk}
+            kwargs={'post_id': self.object.pk}
         )
 
 
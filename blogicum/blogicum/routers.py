@@ -0,0 +1,114 @@
+import asyncio
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+PRIMARY_COOKIE = 'use_primary'
+REPLICA_MODELS = {
+    ('blog', 'post'),
+    ('blog', 'category'),
+    ('blog', 'location'),
+    ('blog', 'comment'),
+}
+
+_replica_reads = ContextVar('replica_reads', default=None)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != 'default']
+
+
+def replica_reads(view):
+    """Marks a read-only view whose anonymous GETs may use a replica."""
+    view.replica_reads = True
+    return view
+
+
+class ReplicaRouter:
+    """
+    Sends reads of blog content to a random replica when it is safe.
+
+    Reads are only routed to replicas inside a request that
+    ``ReplicaMiddleware`` has marked as read-only. Everything else, including
+    sessions, users and all writes, uses the primary (``default``) database.
+    """
+
+    def db_for_read(self, model, **hints):
+        meta = model._meta
+        state = _replica_reads.get()
+        if (
+            state is not None
+            and state['enabled']
+            and (meta.app_label, meta.model_name) in REPLICA_MODELS
+        ):
+            aliases = replica_aliases()
+            if aliases:
+                return random.choice(aliases)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+class ReplicaMiddleware(MiddlewareMixin):
+    """
+    Enables replica reads for anonymous GETs of views marked with
+    ``replica_reads``.
+
+    Authenticated users always read from the primary, so forms and their
+    own pages are never stale. After a write the client gets a short-lived
+    cookie, and its requests read from the primary until it expires so that
+    users see their own changes despite replication lag.
+    """
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        token = _replica_reads.set({'enabled': False})
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+        return self.mark_write(request, response)
+
+    async def __acall__(self, request):
+        token = _replica_reads.set({'enabled': False})
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+        return self.mark_write(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # The state is mutated rather than replaced, so the flag is seen
+        # even when this runs in a copied context of another thread.
+        state = _replica_reads.get()
+        if state is not None:
+            state['enabled'] = (
+                getattr(view_func, 'replica_reads', False)
+                and self.can_use_replica(request)
+            )
+
+    def can_use_replica(self, request):
+        user = getattr(request, 'user', None)
+        return (
+            request.method in ('GET', 'HEAD')
+            and PRIMARY_COOKIE not in request.COOKIES
+            and (user is None or not user.is_authenticated)
+        )
+
+    def mark_write(self, request, response):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and (
+            response.status_code < 400
+        ):
+            response.set_cookie(
+                PRIMARY_COOKIE, '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True, samesite='Lax'
+            )
+        return response
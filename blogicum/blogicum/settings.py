@@ -29,7 +29,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog.metrics.MetricsMiddleware',
+    'blog.profiling.ProfilingMiddleware',
+    'blogicum.template_loaders.TemplateTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'blog.clock.RequestClockMiddleware',
+    'blogicum.routers.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -43,15 +48,59 @@ INTERNAL_IPS = [
     '127.0.0.1',
 ]
 
+METRICS_ENABLED = (os.getenv('METRICS_ENABLED', default='False') == 'True')
+
+# Behind a reverse proxy on the same host every request comes from
+# 127.0.0.1, so set METRICS_TOKEN there; /metrics then requires it as
+# "Authorization: Bearer <token>" instead of checking the address.
+METRICS_ALLOWED_IPS = [
+    ip for ip in os.getenv(
+        'METRICS_ALLOWED_IPS', default='127.0.0.1'
+    ).split(',')
+    if ip
+]
+
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', default='')
+
+SLOW_REQUEST_THRESHOLD = float(
+    os.getenv('SLOW_REQUEST_THRESHOLD', default='1.0')
+)
+
+SLOW_REQUEST_MAX_QUERIES = 100
+
+PROFILING_ENABLED = (os.getenv('PROFILING_ENABLED', default='False') == 'True')
+
+PROFILING_SAMPLE_RATE = float(
+    os.getenv('PROFILING_SAMPLE_RATE', default='0')
+)
+
+PROFILING_MODE = os.getenv('PROFILING_MODE', default='cprofile')
+
+PROFILING_INTERVAL = 0.005
+
+PROFILING_TOKEN_MAX_AGE = 60 * 60
+
+PROFILING_DIR = os.getenv(
+    'PROFILING_DIR', default=str(BASE_DIR / 'profiles')
+)
+
 ROOT_URLCONF = 'blogicum.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': [(
+                'blogicum.template_loaders.TimingLoader' if DEBUG
+                else 'blogicum.template_loaders.Loader',
+                TEMPLATE_LOADERS
+            )],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -62,16 +111,88 @@ TEMPLATES = [
     },
 ]
 
+TEMPLATE_RENDER_BUDGET = 0.05
+
+# The toolbar only looks for app_directories.Loader at the top level of
+# "loaders", not inside the wrapping loader above.
+SILENCED_SYSTEM_CHECKS = ['debug_toolbar.W006']
+
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
+ASYNC_VIEWS = (os.getenv('ASYNC_VIEWS', default='False') == 'True')
+
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'ENGINE': 'blogicum.sqlite3',
+        'NAME': os.getenv('SQLITE_PATH', default=str(BASE_DIR / 'db.sqlite3')),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default='600')),
+        'OPTIONS': {
+            'timeout': float(os.getenv('SQLITE_BUSY_TIMEOUT', default='20')),
+            'pragmas': {
+                'journal_mode': os.getenv(
+                    'SQLITE_JOURNAL_MODE', default='WAL'
+                ),
+                'synchronous': os.getenv(
+                    'SQLITE_SYNCHRONOUS', default='NORMAL'
+                ),
+                'mmap_size': int(
+                    os.getenv('SQLITE_MMAP_SIZE', default=str(256 * 2 ** 20))
+                ),
+                'cache_size': -int(
+                    os.getenv('SQLITE_CACHE_SIZE_KB', default='65536')
+                ),
+                'busy_timeout': int(
+                    float(os.getenv('SQLITE_BUSY_TIMEOUT', default='20'))
+                    * 1000
+                ),
+                'temp_store': 'MEMORY',
+            },
+        },
     }
 }
 
+SQLITE_REPLICAS = [
+    path for path in os.getenv('SQLITE_REPLICAS', default='').split(',')
+    if path
+]
+
+for index, replica_path in enumerate(SQLITE_REPLICAS):
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'NAME': replica_path,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['blogicum.routers.ReplicaRouter']
+
+REPLICA_STICKY_SECONDS = 10
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='blogicum'),
+    }
+}
+
+# django.contrib.sessions.backends.signed_cookies keeps sessions in the
+# cookie; cached_db reads them from the cache and needs a cache shared by
+# all workers, or a logout in one of them is not seen by the others.
+SESSION_ENGINE = os.getenv(
+    'SESSION_ENGINE', default='django.contrib.sessions.backends.db'
+)
+
+# ModelBackend stays for sessions created before the cached backend: they
+# store its path and would otherwise be logged out.
+AUTHENTICATION_BACKENDS = [
+    'blog.auth.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+USER_CACHE_TIMEOUT = 60 * 5
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -91,6 +212,24 @@ MAX_LENGTH = 256
 
 POST_PAGINATION = 10
 
+PAGINATION_ON_EACH_SIDE = 2
+
+COMMENT_PAGINATION = 50
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+CATALOG_CACHE_TIMEOUT = 60
+
+PAGE_CACHE_TIMEOUT = 60 * 5
+
+FEED_ITEMS = 20
+
+NOW_GRANULARITY = 60
+
+POST_CURSOR_PAGINATION = (
+    os.getenv('POST_CURSOR_PAGINATION', default='False') == 'True'
+)
+
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
@@ -100,6 +239,51 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 MEDIA_ROOT = BASE_DIR / 'media'
 MEDIA_URL = '/media/'
 
+# python, x-accel-redirect (nginx), x-sendfile (Apache) or none when the
+# front server serves MEDIA_ROOT at MEDIA_URL itself.
+MEDIA_SERVING = os.getenv('MEDIA_SERVING', default='python')
+
+MEDIA_ACCEL_REDIRECT_LOCATION = os.getenv(
+    'MEDIA_ACCEL_REDIRECT_LOCATION', default='/protected-media/'
+)
+
+MEDIA_IMMUTABLE_PREFIXES = ('posts_images/',)
+
+MEDIA_CACHE_TIMEOUT = 60 * 60
+
+POST_IMAGE_MAX_SIZE = 10 * 1024 * 1024
+
+POST_IMAGE_RENDITIONS = {
+    'feed': 640,
+    'detail': 1280,
+}
+
+POST_IMAGE_QUALITY = 80
+
+POST_IMAGE_SIZES = '(max-width: 640px) 100vw, 640px'
+
+JOBS_ALWAYS_EAGER = (os.getenv('JOBS_ALWAYS_EAGER', default='False') == 'True')
+
+JOBS_MAX_ATTEMPTS = 5
+
+JOBS_RETRY_DELAY = 30
+
+JOBS_TIMEOUT = 60 * 10
+
+JOBS_POLL_INTERVAL = 1
+
+JOBS_DONE_RETENTION = 60 * 60 * 24
+
+JOBS_PRUNE_INTERVAL = 60 * 10
+
+TIMELINE_FANOUT_LIMIT = int(
+    os.getenv('TIMELINE_FANOUT_LIMIT', default='1000')
+)
+
+TIMELINE_BACKFILL = 100
+
+TIMELINE_BATCH_SIZE = 500
+
 LOGIN_REDIRECT_URL = 'blog:index'
 
 LOGIN_URL = 'login'
@@ -118,4 +302,20 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = [BASE_DIR / 'static']
 
+STATIC_ROOT = BASE_DIR / 'static_root'
+
+# blogicum.storage.CompressedManifestStaticFilesStorage fingerprints and
+# precompresses assets on collectstatic.
+STATICFILES_STORAGE = os.getenv(
+    'STATICFILES_STORAGE',
+    default='django.contrib.staticfiles.storage.StaticFilesStorage'
+)
+
+STATIC_COMPRESS_EXTENSIONS = ('.css', '.js', '.svg', '.ico', '.txt', '.map')
+
+# python or none when the front server serves STATIC_ROOT at STATIC_URL.
+STATIC_SERVING = os.getenv('STATIC_SERVING', default='python')
+
+STATIC_CACHE_TIMEOUT = 60 * 60
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -0,0 +1,34 @@
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+PRAGMA_VALUE = re.compile(r'^-?\w+$')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite backend that applies PRAGMAs to every new connection.
+
+    PRAGMAs are taken from ``OPTIONS['pragmas']``, e.g.
+    ``{'journal_mode': 'WAL', 'synchronous': 'NORMAL'}``. Everything else
+    in ``OPTIONS`` is passed to ``sqlite3.connect`` as usual.
+    """
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.pragmas = params.pop('pragmas', {})
+        for name, value in self.pragmas.items():
+            if not PRAGMA_VALUE.match(name) or not PRAGMA_VALUE.match(
+                str(value)
+            ):
+                raise ImproperlyConfigured(
+                    f'Invalid SQLite PRAGMA: {name} = {value}'
+                )
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
@@ -0,0 +1,49 @@
+import gzip
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSORS = {
+    'gz': lambda content: gzip.compress(content, compresslevel=9, mtime=0),
+}
+if brotli is not None:
+    COMPRESSORS['br'] = lambda content: brotli.compress(content)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Manifest storage that also writes precompressed copies of the assets.
+
+    Every hashed file with an extension from ``STATIC_COMPRESS_EXTENSIONS``
+    gets ``.gz`` and, when the ``brotli`` package is installed, ``.br``
+    siblings, which the front server or ``static_view`` can send as is.
+    Hashed names never change content, so existing copies are kept and
+    copies that turn out larger than the original are skipped.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in self.hashed_files.values():
+            _, extension = os.path.splitext(name)
+            if extension in settings.STATIC_COMPRESS_EXTENSIONS:
+                self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as original:
+            content = original.read()
+        for encoding, compressor in COMPRESSORS.items():
+            target = f'{name}.{encoding}'
+            if self.exists(target):
+                continue
+            compressed = compressor(content)
+            if len(compressed) < len(content):
+                self._save(target, ContentFile(compressed))
@@ -0,0 +1,198 @@
+import logging
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.template.base import Node, NodeList
+from django.template.loader_tags import BlockNode, ExtendsNode, IncludeNode
+from django.template.loaders import cached
+from django.template.loaders.base import Loader as BaseLoader
+
+logger = logging.getLogger(__name__)
+
+_render_times = ContextVar('render_times', default=None)
+
+
+def child_nodelists(node):
+    for attr in node.child_nodelists:
+        nodelist = getattr(node, attr, None)
+        if nodelist:
+            yield nodelist
+    for _, nodelist in getattr(node, 'conditions_nodelists', ()):
+        yield nodelist
+
+
+def static_include_name(node):
+    """Returns the template name of a plain ``{% include "name" %}``."""
+    if (
+        not isinstance(node, IncludeNode)
+        or node.extra_context
+        or node.isolated_context
+        or node.template.filters
+        or not isinstance(node.template.var, str)
+    ):
+        return None
+    return node.template.var
+
+
+def is_inlinable(template):
+    """Templates that define blocks or extend others must stay separate."""
+    return not template.nodelist.get_nodes_by_type((BlockNode, ExtendsNode))
+
+
+class InlinedIncludeNode(Node):
+    """
+    Nodes of an included template, rendered in place of ``{% include %}``.
+
+    Like the include, it pushes a context layer and a render context, so
+    variables assigned by the included template and the state of tags such
+    as ``{% cycle %}`` don't leak into the including one.
+    """
+
+    def __init__(self, include, template):
+        self.token = include.token
+        self.origin = include.origin
+        self.template = template
+        self.nodelist = template.nodelist
+
+    def render(self, context):
+        with context.render_context.push_state(self.template):
+            with context.push():
+                return self.nodelist.render(context)
+
+
+class Loader(cached.Loader):
+    """
+    Cached loader that inlines static includes into the including template.
+
+    ``{% include "name" %}`` with a constant name and no ``with``/``only``
+    is replaced by the nodes of the included template when the template is
+    first loaded, so rendering it doesn't resolve and look up the included
+    template for every include.
+    """
+
+    def __init__(self, engine, loaders):
+        super().__init__(engine, loaders)
+        self.inlined = set()
+        self.inlining = set()
+
+    def get_template(self, template_name, skip=None):
+        template = super().get_template(template_name, skip)
+        if id(template) not in self.inlined | self.inlining:
+            self.inlining.add(id(template))
+            try:
+                self.inline(template.nodelist)
+            finally:
+                self.inlining.discard(id(template))
+            self.inlined.add(id(template))
+        return template
+
+    def inline(self, nodelist):
+        for index in reversed(range(len(nodelist))):
+            node = nodelist[index]
+            name = static_include_name(node)
+            if name is None:
+                for child in child_nodelists(node):
+                    self.inline(child)
+                continue
+            included = self.get_template(name)
+            if id(included) in self.inlining or not is_inlinable(included):
+                continue
+            nodelist[index] = InlinedIncludeNode(node, included)
+
+    def reset(self):
+        super().reset()
+        self.inlined.clear()
+
+
+class TimedNodeList(NodeList):
+    """Adds the render time of a template to the request's totals."""
+
+    def __init__(self, nodelist, name):
+        super().__init__(nodelist)
+        self.contains_nontext = nodelist.contains_nontext
+        self.name = name
+
+    def render(self, context):
+        times = _render_times.get()
+        if times is None:
+            return super().render(context)
+        started = time.perf_counter()
+        try:
+            return super().render(context)
+        finally:
+            total, count = times.get(self.name, (0, 0))
+            times[self.name] = (
+                total + time.perf_counter() - started, count + 1
+            )
+
+
+class TimingLoader(BaseLoader):
+    """
+    Development loader that measures how long each template renders.
+
+    Wraps ``loaders`` like the cached loader, but without caching, so
+    template changes are still picked up on the next request.
+    """
+
+    def __init__(self, engine, loaders):
+        super().__init__(engine)
+        self.loaders = engine.get_template_loaders(loaders)
+
+    def get_contents(self, origin):
+        return origin.loader.get_contents(origin)
+
+    def get_template_sources(self, template_name):
+        for loader in self.loaders:
+            yield from loader.get_template_sources(template_name)
+
+    def get_template(self, template_name, skip=None):
+        template = super().get_template(template_name, skip)
+        template.nodelist = TimedNodeList(template.nodelist, template_name)
+        return template
+
+
+class TemplateTimingMiddleware:
+    """
+    Reports cumulative render time per template in development.
+
+    Totals include nested templates. They are sent in the ``Server-Timing``
+    header, and logged as a warning when the whole render takes longer than
+    ``TEMPLATE_RENDER_BUDGET`` seconds.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DEBUG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        times = {}
+        token = _render_times.set(times)
+        try:
+            response = self.get_response(request)
+        finally:
+            _render_times.reset(token)
+        if times:
+            self.report(request, response, times)
+        return response
+
+    def report(self, request, response, times):
+        ranked = sorted(times.items(), key=lambda item: -item[1][0])
+        response['Server-Timing'] = ', '.join(
+            f'tpl{index};dur={total * 1000:.2f};desc="{name} x{count}"'
+            for index, (name, (total, count)) in enumerate(ranked)
+        )
+        _, (elapsed, _) = ranked[0]
+        if elapsed > settings.TEMPLATE_RENDER_BUDGET:
+            logger.warning(
+                'Templates of %s rendered in %.1f ms, over the %.1f ms '
+                'budget\n%s',
+                request.path, elapsed * 1000,
+                settings.TEMPLATE_RENDER_BUDGET * 1000,
+                '\n'.join(
+                    f'  {total * 1000:8.1f} ms {count:4d}x {name}'
+                    for name, (total, count) in ranked
+                )
+            )
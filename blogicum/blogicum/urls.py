@@ -1,12 +1,17 @@
+import re
+
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
-from django.urls import include, path, reverse_lazy
+from django.urls import include, path, re_path, reverse_lazy
 from django.views.generic.edit import CreateView
 
+from blog.media import media_view, static_view
+from blog.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     path('', include('blog.urls', namespace='blog')),
     path('posts/', include('blog.urls', namespace='blog')),
     path('category/', include('blog.urls', namespace='blog')),
@@ -24,7 +29,16 @@ urlpatterns = [
 if settings.DEBUG:
     import debug_toolbar
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+if settings.MEDIA_SERVING != 'none':
+    urlpatterns.append(re_path(
+        r'^{}(?P<path>.*)$'.format(re.escape(settings.MEDIA_URL.lstrip('/'))),
+        media_view, name='media'
+    ))
+if settings.STATIC_SERVING != 'none':
+    urlpatterns.append(re_path(
+        r'^{}(?P<path>.*)$'.format(re.escape(settings.STATIC_URL.lstrip('/'))),
+        static_view, name='static'
+    ))
 
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error_500'
@@ -5,4 +5,20 @@ document.getElementById('themeToggle').addEventListener('click', function() {
     } else {
         document.body.className = 'light-theme';
     }
-})
\ No newline at end of file
+})
+
+const loadComments = document.getElementById('loadComments');
+if (loadComments) {
+    loadComments.addEventListener('click', function() {
+        fetch(loadComments.dataset.url)
+            .then(response => response.json())
+            .then(data => {
+                document.getElementById('comments').insertAdjacentHTML('beforeend', data.html);
+                if (data.next) {
+                    loadComments.dataset.url = data.next;
+                } else {
+                    loadComments.remove();
+                }
+            });
+    });
+}
\ No newline at end of file
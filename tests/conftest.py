@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(username='author')
+
+
+@pytest.fixture
+def another_user(django_user_model):
+    return django_user_model.objects.create_user(username='reader')
+
+
+@pytest.fixture
+def user_client(client, user):
+    client.force_login(user)
+    return client
+
+
+@pytest.fixture
+def another_user_client(client, another_user):
+    client.force_login(another_user)
+    return client
+
+
+@pytest.fixture
+def category():
+    return Category.objects.create(
+        title='Собаки', description='Про собак', slug='dogs'
+    )
+
+
+@pytest.fixture
+def location():
+    return Location.objects.create(name='Парк')
+
+
+@pytest.fixture
+def posts(user, category, location):
+    now = timezone.now()
+    return [
+        Post.objects.create(
+            title=f'Пост {index}',
+            text='Текст про собак',
+            pub_date=now - timedelta(days=index + 1),
+            author=user,
+            category=category,
+            location=location,
+        )
+        for index in range(15)
+    ]
+
+
+@pytest.fixture
+def post(posts):
+    return posts[0]
+
+
+@pytest.fixture
+def comments(post, user, another_user):
+    return [
+        Comment.objects.create(post=post, author=author, text='Хороший пёс')
+        for author in (user, another_user) * 8
+    ]
+
+
+@pytest.fixture
+def comment(comments):
+    return comments[0]
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.test import RequestFactory
+
+from blog import async_views
+from blog.models import Post
+
+# Async views query the database from worker threads, which only see
+# committed rows.
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def call(view, path='/', **kwargs):
+    # Anonymous pages are cached by path, so each call needs its own.
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    return asyncio.run(view(request, **kwargs))
+
+
+def test_post_list(posts):
+    response = call(async_views.post_list)
+    assert response.status_code == 200
+    assert posts[0].title in response.content.decode()
+
+
+def test_category_posts(posts, category):
+    response = call(
+        async_views.category_posts, f'/{category.slug}/',
+        category_slug=category.slug
+    )
+    assert response.status_code == 200
+    with pytest.raises(Http404):
+        call(
+            async_views.category_posts, '/missing/',
+            category_slug='missing'
+        )
+
+
+def test_post_detail(post, comments):
+    response = call(async_views.post_detail, post_id=post.pk)
+    assert response.status_code == 200
+    assert comments[0].text in response.content.decode()
+
+
+def test_hidden_post_detail(post):
+    Post.objects.filter(pk=post.pk).update(is_published=False)
+    with pytest.raises(Http404):
+        call(async_views.post_detail, post_id=post.pk)
+
+
+def test_profile(posts, user):
+    response = call(async_views.profile, username=user.username)
+    assert response.status_code == 200
+    assert posts[0].title in response.content.decode()
@@ -0,0 +1,14 @@
+import pytest
+from django.urls import reverse
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize('backend', (
+    'blog.auth.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+))
+def test_sessions_of_both_backends_stay_logged_in(client, user, backend):
+    client.force_login(user, backend=backend)
+    response = client.get(reverse('blog:edit_profile'))
+    assert response.status_code == 200
@@ -0,0 +1,24 @@
+import pytest
+
+from blog import catalog
+from blog.models import Category
+
+pytestmark = pytest.mark.django_db
+
+
+def test_snapshot_expires(settings, category, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(catalog.time, 'monotonic', lambda: now)
+    assert catalog.get_published_category('dogs') == category
+    # Changes without signals are only seen once the snapshot expires.
+    Category.objects.filter(pk=category.pk).update(is_published=False)
+    assert catalog.get_published_category('dogs') == category
+    now += settings.CATALOG_CACHE_TIMEOUT
+    assert catalog.get_published_category('dogs') is None
+
+
+def test_snapshot_follows_signals(category):
+    assert catalog.get_published_category('dogs') == category
+    category.is_published = False
+    category.save()
+    assert catalog.get_published_category('dogs') is None
@@ -0,0 +1,11 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Category
+
+pytestmark = pytest.mark.django_db
+
+
+def test_feed_plans_use_indexes(category):
+    call_command('check_query_plans')
+    assert list(Category.objects.all()) == [category]
@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blog import clock
+from blog.clock import RequestClockMiddleware, ceil_time, floor_time
+
+MOMENT = datetime(2024, 5, 1, 12, 34, 56, 789, tzinfo=timezone.utc)
+
+
+def test_rounding(settings):
+    settings.NOW_GRANULARITY = 60
+    assert floor_time(MOMENT) == MOMENT.replace(second=0, microsecond=0)
+    assert ceil_time(MOMENT) == MOMENT.replace(
+        minute=35, second=0, microsecond=0
+    )
+    rounded = MOMENT.replace(second=0, microsecond=0)
+    assert ceil_time(rounded) == rounded
+    settings.NOW_GRANULARITY = 1
+    assert floor_time(MOMENT) == MOMENT.replace(microsecond=0)
+
+
+def test_now_is_fixed_for_the_request(settings, monkeypatch):
+    settings.NOW_GRANULARITY = 60
+    seen = []
+
+    def view(request):
+        seen.append(clock.now())
+        monkeypatch.setattr(
+            clock.timezone, 'now', lambda: MOMENT.replace(hour=13)
+        )
+        seen.append(clock.now())
+        return HttpResponse()
+
+    monkeypatch.setattr(clock.timezone, 'now', lambda: MOMENT)
+    RequestClockMiddleware(view)(RequestFactory().get('/'))
+    assert seen == [floor_time(MOMENT)] * 2
+    # Outside a request the rounded current time is returned.
+    assert clock.now() == floor_time(MOMENT.replace(hour=13))
@@ -0,0 +1,43 @@
+import pytest
+from django.db import DatabaseError, transaction
+from django.db.models.signals import pre_delete
+
+from blog.models import Comment, Post
+
+pytestmark = pytest.mark.django_db
+
+
+def test_comment_count_follows_comments(post, comments):
+    post.refresh_from_db()
+    assert post.comment_count == len(comments)
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == len(comments) - 1
+
+
+@pytest.mark.parametrize('delete', (
+    lambda post: post.delete(),
+    lambda post: Post.objects.filter(pk=post.pk).delete(),
+))
+def test_cascade_skips_counter_updates(
+    django_assert_max_num_queries, post, comments, delete
+):
+    # Without the skip every comment would cost an UPDATE of the post.
+    with django_assert_max_num_queries(len(comments) // 2):
+        delete(post)
+    assert not Comment.objects.exists()
+
+
+def test_failed_delete_keeps_counting(post, comments):
+    def fail(**kwargs):
+        raise DatabaseError
+
+    pre_delete.connect(fail, sender=Post)
+    try:
+        with pytest.raises(DatabaseError), transaction.atomic():
+            post.delete()
+    finally:
+        pre_delete.disconnect(fail, sender=Post)
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == len(comments) - 1
@@ -0,0 +1,39 @@
+import pytest
+
+from blog.models import Category, Post
+from blog.views import filtering
+
+pytestmark = pytest.mark.django_db
+
+
+def test_hidden_categories_are_filtered_out(posts, category):
+    hidden = Category.objects.create(
+        title='Скрытая', description='', slug='hidden', is_published=False
+    )
+    visible, in_hidden, without = posts[:3]
+    Post.objects.filter(pk=in_hidden.pk).update(category=hidden)
+    Post.objects.filter(pk=without.pk).update(category=None)
+    shown = set(filtering(Post.objects).values_list('pk', flat=True))
+    assert visible.pk in shown
+    assert in_hidden.pk not in shown
+    assert without.pk not in shown
+    assert len(shown) == len(posts) - 2
+
+
+def test_categories_missing_from_snapshot(posts, category):
+    assert list(filtering(Post.objects)[:1])
+    # Created without signals, as another process would look to this one.
+    Category.objects.bulk_create([
+        Category(title='Новая', description='', slug='new'),
+        Category(
+            title='Скрытая', description='', slug='hidden',
+            is_published=False
+        ),
+    ])
+    new = Category.objects.get(slug='new')
+    hidden = Category.objects.get(slug='hidden')
+    Post.objects.filter(pk=posts[0].pk).update(category=new)
+    Post.objects.filter(pk=posts[1].pk).update(category=hidden)
+    shown = {post.pk: post for post in filtering(Post.objects)}
+    assert shown[posts[0].pk].category == new
+    assert posts[1].pk not in shown
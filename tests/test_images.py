@@ -0,0 +1,61 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.template import Context, Template
+from PIL import Image
+
+from blog.images import (generate_renditions, rendition_name,
+                         renditions_exist, srcset)
+from blog.models import Post
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return FileSystemStorage(location=tmp_path, base_url='/media/')
+
+
+def save_image(storage, name, size):
+    buffer = BytesIO()
+    Image.new('RGB', size, 'brown').save(buffer, 'JPEG')
+    return storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def test_renditions(settings, storage):
+    name = save_image(storage, 'posts_images/dog.jpg', (2000, 1000))
+    assert not renditions_exist(name, storage)
+    generate_renditions(name, storage)
+    assert renditions_exist(name, storage)
+    for rendition, width in settings.POST_IMAGE_RENDITIONS.items():
+        for extension in ('jpg', 'webp'):
+            with storage.open(
+                rendition_name(name, rendition, extension)
+            ) as file:
+                assert Image.open(file).size == (width, width // 2)
+    assert srcset(name, 'webp', storage) == ', '.join(
+        f'/media/posts_images/dog_{rendition}.webp {width}w'
+        for rendition, width in settings.POST_IMAGE_RENDITIONS.items()
+    )
+
+
+def test_small_images_are_not_upscaled(storage):
+    name = save_image(storage, 'posts_images/puppy.jpg', (300, 200))
+    generate_renditions(name, storage)
+    with storage.open(rendition_name(name, 'detail', 'jpg')) as file:
+        assert Image.open(file).size == (300, 200)
+
+
+@pytest.mark.django_db
+def test_post_image_tag_uses_renditions(settings, tmp_path, post):
+    settings.MEDIA_ROOT = tmp_path
+    post.image = save_image(
+        Post.image.field.storage, 'posts_images/dog.jpg', (1000, 500)
+    )
+    generate_renditions(post.image.name)
+    html = Template('{% load blog_images %}{% post_image post %}').render(
+        Context({'post': post})
+    )
+    assert '<picture>' in html
+    assert 'dog_feed.jpg' in html
+    assert srcset(post.image.name, 'webp') in html
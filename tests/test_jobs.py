@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+import pytest
+from django.template import Context, Template
+from django.utils import timezone
+
+from blog.jobs import execute_job, prune_jobs
+from blog.models import Follow, Job, Post
+
+pytestmark = pytest.mark.django_db
+
+
+def test_prune_jobs(settings):
+    old = timezone.now() - timedelta(
+        seconds=settings.JOBS_DONE_RETENTION + 1
+    )
+    kept = [
+        Job.objects.create(name='fan_out_post', status=status, run_after=old)
+        for status in (Job.PENDING, Job.FAILED)
+    ]
+    kept.append(Job.objects.create(name='fan_out_post', status=Job.DONE))
+    Job.objects.create(name='fan_out_post', status=Job.DONE, run_after=old)
+    assert prune_jobs() == 1
+    assert list(Job.objects.order_by('pk')) == kept
+
+
+def test_fan_out_only_with_followers(
+    settings, user, another_user, category
+):
+    settings.JOBS_ALWAYS_EAGER = False
+    post = Post.objects.create(
+        title='Пост', text='Текст', author=user, category=category,
+        pub_date=timezone.now()
+    )
+    assert not Job.objects.filter(name='fan_out_post').exists()
+    Follow.objects.create(user=another_user, author=user)
+    post.save()
+    assert Job.objects.filter(
+        name='fan_out_post', payload={'post_id': post.pk}
+    ).exists()
+
+
+def test_image_without_queued_job_falls_back_to_original(settings, post):
+    Post.objects.filter(pk=post.pk).update(image='posts_images/missing.jpg')
+    post.refresh_from_db()
+    template = Template('{% load blog_images %}{% post_image post %}')
+    html = template.render(Context({'post': post}))
+    assert f'src="{post.image.url}"' in html
+    job = Job.objects.create(
+        name='process_post_image',
+        payload={'post_id': post.pk, 'name': post.image.name},
+        status=Job.RUNNING,
+        attempts=settings.JOBS_MAX_ATTEMPTS,
+    )
+    assert 'обрабатывается' in template.render(Context({'post': post}))
+    assert execute_job(job.pk) == Job.FAILED
+    html = template.render(Context({'post': post}))
+    assert 'обрабатывается' not in html
+    assert f'src="{post.image.url}"' in html
+
+
+def test_image_jobs_are_looked_up_once_per_page(
+    django_assert_num_queries, posts
+):
+    for post in posts:
+        post.image = f'posts_images/{post.pk}.jpg'
+        Post.objects.filter(pk=post.pk).update(image=post.image.name)
+    Job.objects.create(
+        name='process_post_image',
+        payload={'post_id': posts[0].pk, 'name': posts[0].image.name},
+    )
+    template = Template(
+        '{% load blog_images %}'
+        '{% for post in posts %}{% post_image post %}{% endfor %}'
+    )
+    with django_assert_num_queries(1):
+        html = template.render(Context({'posts': posts}))
+    assert html.count('обрабатывается') == 1
@@ -0,0 +1,101 @@
+import pytest
+
+from blog.media import parse_range
+
+CONTENT = b'0123456789'
+
+
+@pytest.fixture
+def media_file(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    (tmp_path / 'posts_images').mkdir()
+    (tmp_path / 'posts_images' / 'dog.txt').write_bytes(CONTENT)
+    (tmp_path.parent / 'secret.txt').write_bytes(b'secret')
+    return '/media/posts_images/dog.txt'
+
+
+@pytest.mark.parametrize('header, expected', (
+    (None, None),
+    ('bytes=2-4', (2, 4)),
+    ('bytes=7-', (7, 9)),
+    ('bytes=-3', (7, 9)),
+    ('bytes=5-100', (5, 9)),
+    ('bytes=5-2', None),
+    ('bytes=0-1,3-4', None),
+    ('items=0-1', None),
+))
+def test_parse_range(header, expected):
+    assert parse_range(header, len(CONTENT)) == expected
+
+
+@pytest.mark.parametrize('header', ('bytes=10-', 'bytes=-0'))
+def test_parse_unsatisfiable_range(header):
+    with pytest.raises(ValueError):
+        parse_range(header, len(CONTENT))
+
+
+def read(response):
+    return b''.join(response.streaming_content)
+
+
+def test_full_file(client, media_file):
+    response = client.get(media_file)
+    assert response.status_code == 200
+    assert read(response) == CONTENT
+    assert response['Accept-Ranges'] == 'bytes'
+    assert 'immutable' in response['Cache-Control']
+
+
+def test_range(client, media_file):
+    response = client.get(media_file, HTTP_RANGE='bytes=2-4')
+    assert response.status_code == 206
+    assert read(response) == b'234'
+    assert response['Content-Range'] == f'bytes 2-4/{len(CONTENT)}'
+    assert response['Content-Length'] == '3'
+
+
+@pytest.mark.parametrize('header', ('bytes=5-2', 'bytes=0-1,3-4'))
+def test_ignored_range(client, media_file, header):
+    response = client.get(media_file, HTTP_RANGE=header)
+    assert response.status_code == 200
+    assert read(response) == CONTENT
+
+
+def test_unsatisfiable_range(client, media_file):
+    response = client.get(media_file, HTTP_RANGE='bytes=10-')
+    assert response.status_code == 416
+    assert response['Content-Range'] == f'bytes */{len(CONTENT)}'
+
+
+def test_stale_if_range_sends_whole_file(client, media_file):
+    response = client.get(
+        media_file, HTTP_RANGE='bytes=2-4', HTTP_IF_RANGE='"stale"'
+    )
+    assert response.status_code == 200
+    assert read(response) == CONTENT
+
+
+def test_etag(client, media_file):
+    etag = client.get(media_file)['ETag']
+    response = client.get(media_file, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response['ETag'] == etag
+    response = client.get(
+        media_file, HTTP_IF_RANGE=etag, HTTP_RANGE='bytes=0-0'
+    )
+    assert response.status_code == 206
+
+
+def test_path_traversal(client, media_file):
+    assert client.get('/media/../secret.txt').status_code == 400
+    assert client.get('/media/posts_images/missing.txt').status_code == 404
+
+
+def test_x_accel_redirect(client, settings, media_file):
+    settings.MEDIA_SERVING = 'x-accel-redirect'
+    response = client.get(media_file)
+    assert response.status_code == 200
+    assert response.content == b''
+    assert response['X-Accel-Redirect'] == (
+        settings.MEDIA_ACCEL_REDIRECT_LOCATION + 'posts_images/dog.txt'
+    )
@@ -0,0 +1,28 @@
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+
+def test_metrics_disabled_by_default(client):
+    assert client.get('/metrics').status_code == HTTPStatus.NOT_FOUND
+
+
+def test_metrics_allowed_ips(settings, client):
+    settings.METRICS_ENABLED = True
+    assert client.get('/metrics').status_code == HTTPStatus.OK
+    settings.METRICS_ALLOWED_IPS = ['10.0.0.1']
+    assert client.get('/metrics').status_code == HTTPStatus.NOT_FOUND
+
+
+def test_metrics_token(settings, client):
+    settings.METRICS_ENABLED = True
+    settings.METRICS_TOKEN = 'secret'
+    assert client.get('/metrics').status_code == HTTPStatus.NOT_FOUND
+    assert client.get(
+        '/metrics', HTTP_AUTHORIZATION='Bearer wrong'
+    ).status_code == HTTPStatus.NOT_FOUND
+    response = client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+    assert response.status_code == HTTPStatus.OK
+    assert b'blogicum_requests_total' in response.content
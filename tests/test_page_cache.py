@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date
+
+from blog.cache import page_cache_timeout
+from blog.models import Comment, Post
+
+pytestmark = pytest.mark.django_db
+
+FEED_URL = reverse('blog:posts_feed', args=('rss',))
+
+
+def test_timeout_is_capped_by_scheduled_post(settings, post):
+    assert page_cache_timeout() == settings.PAGE_CACHE_TIMEOUT
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() + timedelta(seconds=90)
+    )
+    # The post is shown from its pub_date rounded up to the request clock.
+    assert 90 <= page_cache_timeout() <= 90 + settings.NOW_GRANULARITY
+
+
+@pytest.mark.skipif(
+    settings.ASYNC_VIEWS, reason='routes are served by blog.async_views'
+)
+@pytest.mark.parametrize('url', (reverse('blog:index'), FEED_URL))
+def test_not_modified(client, posts, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    etag, modified = response['ETag'], response['Last-Modified']
+    for headers in (
+        {'HTTP_IF_NONE_MATCH': etag},
+        {'HTTP_IF_MODIFIED_SINCE': modified},
+    ):
+        response = client.get(url, **headers)
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(
+        parse_http_date(modified) - 1
+    ))
+    assert response.status_code == 200
+
+
+def test_feed_is_not_invalidated_by_comments(
+    client, django_assert_num_queries, post, another_user
+):
+    etag = client.get(FEED_URL)['ETag']
+    Comment.objects.create(post=post, author=another_user, text='Гав')
+    with django_assert_num_queries(0):
+        response = client.get(FEED_URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+
+def test_feed_last_modified_never_goes_back(client, posts):
+    Post.objects.update(updated_at=F('pub_date'))
+    modified = parse_http_date(client.get(FEED_URL)['Last-Modified'])
+    newest = max(posts, key=lambda post: post.pub_date)
+    newest.delete()
+    response = client.get(FEED_URL)
+    assert parse_http_date(response['Last-Modified']) >= modified
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.async_views import paginate
+from blog.models import Post
+from blog.paginators import CursorPaginator
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def same_date_posts(user, category):
+    pub_date = timezone.now() - timedelta(days=1)
+    return [
+        Post.objects.create(
+            title=f'Пост {number}', text='Текст', author=user,
+            category=category, pub_date=pub_date
+        )
+        for number in range(settings.POST_PAGINATION * 2 + 3)
+    ]
+
+
+def walk(paginator, page):
+    pages = [page]
+    while page.has_next():
+        page = paginator.page(page.next_cursor)
+        pages.append(page)
+    return pages
+
+
+def test_cursor_pages_with_equal_dates(same_date_posts):
+    paginator = CursorPaginator(
+        Post.objects.all(), settings.POST_PAGINATION
+    )
+    pages = walk(paginator, paginator.page())
+    pks = [post.pk for page in pages for post in page]
+    assert len(pks) == len(set(pks)) == len(same_date_posts)
+    assert pks == sorted(pks, reverse=True)
+    # Going back from the last page gives the same pages.
+    page = pages[-1]
+    for expected in reversed(pages[:-1]):
+        page = paginator.page(page.previous_cursor)
+        assert list(page) == list(expected)
+    assert not page.has_previous()
+
+
+@pytest.mark.parametrize('cursor', ('garbage', 'a' * 200, ''))
+def test_malformed_cursor_gives_first_page(same_date_posts, cursor):
+    paginator = CursorPaginator(
+        Post.objects.all(), settings.POST_PAGINATION
+    )
+    assert list(paginator.page(cursor)) == list(paginator.page())
+
+
+@pytest.mark.skipif(
+    settings.ASYNC_VIEWS, reason='routes are served by blog.async_views'
+)
+def test_view_with_malformed_cursor(client, settings, same_date_posts):
+    settings.POST_CURSOR_PAGINATION = True
+    response = client.get(reverse('blog:index'), {'cursor': 'garbage'})
+    assert response.status_code == 200
+    first = client.get(reverse('blog:index'))
+    assert (
+        list(response.context['page_obj'])
+        == list(first.context['page_obj'])
+    )
+
+
+def test_async_paginate_with_malformed_cursor(settings, same_date_posts):
+    settings.POST_CURSOR_PAGINATION = True
+    request = RequestFactory().get('/', {'cursor': 'garbage'})
+    context = paginate(request, Post.objects.all())
+    assert list(context['page_obj']) == same_date_posts[::-1][
+        :settings.POST_PAGINATION
+    ]
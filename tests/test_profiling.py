@@ -0,0 +1,37 @@
+import pytest
+from django.urls import reverse
+
+from blog.profiling import PROFILE_HEADER, make_token
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def profiling(settings, tmp_path):
+    settings.PROFILING_ENABLED = True
+    settings.PROFILING_SAMPLE_RATE = 0
+    settings.PROFILING_DIR = str(tmp_path)
+    settings.PROFILING_INTERVAL = 0.001
+    return tmp_path
+
+
+def test_only_requests_with_valid_token_are_profiled(client, profiling):
+    url = reverse('pages:about')
+    client.get(url)
+    client.get(url, **{PROFILE_HEADER: 'profile:forged'})
+    assert not list(profiling.iterdir())
+    client.get(url, **{PROFILE_HEADER: make_token()})
+    spooled, = profiling.iterdir()
+    assert spooled.suffix == '.prof'
+
+
+def test_sampler_writes_collapsed_stacks(client, settings, profiling):
+    settings.PROFILING_MODE = 'sampler'
+    settings.PROFILING_SAMPLE_RATE = 1
+    client.get(reverse('blog:index'))
+    spooled, = profiling.iterdir()
+    assert spooled.suffix == '.collapsed'
+    for line in spooled.read_text().splitlines():
+        stack, count = line.rsplit(' ', 1)
+        assert int(count) > 0
+        assert ';' in stack
@@ -0,0 +1,220 @@
+"""
+Query budgets of the blog views.
+
+Every view is requested once to warm per-process caches (catalog, session
+user, follower counts), and the next request must stay within its budget.
+A new query in a view, or one repeated per post or comment, fails here.
+"""
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.urls import reverse
+
+from blog.models import Comment, Follow, Post
+
+pytestmark = pytest.mark.django_db
+
+# With ASYNC_VIEWS these routes are served by blog.async_views, whose
+# worker threads can't see the rows of the test transaction.
+sync_views_only = pytest.mark.skipif(
+    settings.ASYNC_VIEWS, reason='routes are served by blog.async_views'
+)
+
+
+def get_within_budget(client, url, queries, django_assert_num_queries):
+    client.get(url)
+    with django_assert_num_queries(queries):
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return response
+
+
+@pytest.mark.parametrize('name, args', (
+    pytest.param('blog:index', (), marks=sync_views_only),
+    pytest.param('blog:category_posts', ('dogs',), marks=sync_views_only),
+    ('blog:posts_feed', ('rss',)),
+    ('blog:category_feed', ('dogs', 'atom')),
+    ('blog:author_feed', ('author', 'json')),
+))
+def test_anonymous_cached_pages(
+    client, posts, name, args, django_assert_num_queries
+):
+    get_within_budget(
+        client, reverse(name, args=args), 0, django_assert_num_queries
+    )
+
+
+@sync_views_only
+@pytest.mark.parametrize('name, args', (
+    ('blog:index', ()),
+    ('blog:category_posts', ('dogs',)),
+))
+def test_feed_pages(
+    another_user_client, posts, name, args, django_assert_num_queries
+):
+    # Session and the page of posts with authors; the catalog and the
+    # post count are cached.
+    response = get_within_budget(
+        another_user_client, reverse(name, args=args), 2,
+        django_assert_num_queries
+    )
+    assert len(response.context['page_obj']) == 10
+
+
+@sync_views_only
+def test_profile_anonymous(client, posts, django_assert_num_queries):
+    # Author and the page of posts.
+    get_within_budget(
+        client, reverse('blog:profile', args=('author',)), 2,
+        django_assert_num_queries
+    )
+
+
+@sync_views_only
+@pytest.mark.parametrize('user_client_fixture', (
+    'user_client', 'another_user_client'
+))
+def test_profile_authenticated(
+    request, user_client_fixture, posts, django_assert_num_queries
+):
+    # Session, author, follow state and the page of posts.
+    get_within_budget(
+        request.getfixturevalue(user_client_fixture),
+        reverse('blog:profile', args=('author',)), 4,
+        django_assert_num_queries
+    )
+
+
+@sync_views_only
+def test_post_detail(client, post, comments, django_assert_num_queries):
+    # Post with its relations and the page of comments with authors.
+    response = get_within_budget(
+        client, reverse('blog:post_detail', args=(post.pk,)), 2,
+        django_assert_num_queries
+    )
+    assert len(response.context['comments']) == len(comments)
+
+
+@sync_views_only
+def test_post_detail_authenticated(
+    another_user_client, post, comments, django_assert_num_queries
+):
+    get_within_budget(
+        another_user_client, reverse('blog:post_detail', args=(post.pk,)),
+        3, django_assert_num_queries
+    )
+
+
+def test_comments(client, post, comments, django_assert_num_queries):
+    get_within_budget(
+        client, reverse('blog:comments', args=(post.pk,)), 2,
+        django_assert_num_queries
+    )
+
+
+def test_search(client, posts, django_assert_num_queries):
+    # Count of matches and the page of posts.
+    response = get_within_budget(
+        client, reverse('blog:search') + '?q=собак', 2,
+        django_assert_num_queries
+    )
+    assert len(response.context['page_obj']) == 10
+
+
+def test_home_feed(
+    another_user_client, another_user, user, posts, django_assert_num_queries
+):
+    Follow.objects.create(user=another_user, author=user)
+    # Session, followed authors, count of entries, their page and the posts.
+    response = get_within_budget(
+        another_user_client, reverse('blog:feed'), 5,
+        django_assert_num_queries
+    )
+    assert len(response.context['page_obj']) == 10
+
+
+def test_edit_profile(user_client, django_assert_num_queries):
+    get_within_budget(
+        user_client, reverse('blog:edit_profile'), 1,
+        django_assert_num_queries
+    )
+
+
+def test_create_post_form(user_client, django_assert_num_queries):
+    # Session and the choices of locations and categories.
+    get_within_budget(
+        user_client, reverse('blog:create_post'), 3,
+        django_assert_num_queries
+    )
+
+
+def test_edit_post_form(user_client, post, django_assert_num_queries):
+    # The post is loaded once for the permission check and the form.
+    get_within_budget(
+        user_client, reverse('blog:edit_post', args=(post.pk,)), 4,
+        django_assert_num_queries
+    )
+
+
+def test_delete_post_form(user_client, post, django_assert_num_queries):
+    get_within_budget(
+        user_client, reverse('blog:delete_post', args=(post.pk,)), 2,
+        django_assert_num_queries
+    )
+
+
+@pytest.mark.parametrize('name', ('blog:edit_comment', 'blog:delete_comment'))
+def test_comment_forms(
+    user_client, post, comment, name, django_assert_num_queries
+):
+    get_within_budget(
+        user_client, reverse(name, args=(post.pk, comment.pk)), 2,
+        django_assert_num_queries
+    )
+
+
+def test_follow(
+    another_user_client, another_user, posts, django_assert_num_queries
+):
+    url = reverse('blog:follow', args=('author',))
+    another_user_client.get(reverse('blog:edit_profile'))
+    with django_assert_num_queries(9):
+        response = another_user_client.post(url)
+    assert response.status_code == HTTPStatus.FOUND
+    assert Follow.objects.filter(user=another_user).exists()
+
+
+def test_unfollow(
+    another_user_client, another_user, user, django_assert_num_queries
+):
+    Follow.objects.create(user=another_user, author=user)
+    url = reverse('blog:unfollow', args=('author',))
+    another_user_client.get(reverse('blog:edit_profile'))
+    with django_assert_num_queries(5):
+        response = another_user_client.post(url)
+    assert response.status_code == HTTPStatus.FOUND
+    assert not Follow.objects.filter(user=another_user).exists()
+
+
+def test_add_comment(user_client, post, django_assert_num_queries):
+    url = reverse('blog:add_comment', args=(post.pk,))
+    user_client.get(reverse('blog:edit_profile'))
+    with django_assert_num_queries(4):
+        response = user_client.post(url, {'text': 'Гав'})
+    assert response.status_code == HTTPStatus.FOUND
+    post.refresh_from_db()
+    assert post.comment_count == 1
+
+
+def test_delete_post_with_comments(
+    user_client, post, comments, django_assert_num_queries
+):
+    url = reverse('blog:delete_post', args=(post.pk,))
+    user_client.get(reverse('blog:edit_profile'))
+    # The comment counter isn't updated for every cascaded comment.
+    with django_assert_num_queries(6):
+        response = user_client.post(url)
+    assert response.status_code == HTTPStatus.FOUND
+    assert not Post.objects.filter(pk=post.pk).exists()
+    assert not Comment.objects.filter(post_id=post.pk).exists()
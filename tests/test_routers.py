@@ -0,0 +1,68 @@
+import sqlite3
+
+import pytest
+from django.db import connections
+from django.urls import reverse
+
+from blog.models import Post
+from blogicum.routers import PRIMARY_COOKIE
+
+REPLICA = 'replica_0'
+NEW_TITLE = 'Свежий заголовок'
+
+pytestmark = pytest.mark.filterwarnings(
+    'ignore:Overriding setting DATABASES'
+)
+
+
+@pytest.fixture
+def replica(transactional_db, settings, tmp_path, post):
+    """
+    Adds a second SQLite alias holding a snapshot of the primary, then
+    renames the post on the primary only.
+    """
+    path = tmp_path / 'replica.sqlite3'
+    connections['default'].ensure_connection()
+    target = sqlite3.connect(path)
+    connections['default'].connection.backup(target)
+    target.close()
+    replica_settings = {**connections['default'].settings_dict}
+    replica_settings['NAME'] = str(path)
+    settings.DATABASES = {
+        **settings.DATABASES, REPLICA: replica_settings
+    }
+    connections.databases[REPLICA] = replica_settings
+    post.title = NEW_TITLE
+    post.save()
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.databases[REPLICA]
+
+
+def test_anonymous_get_reads_from_replica(client, post, replica):
+    url = reverse('blog:post_detail', args=(post.pk,))
+    content = client.get(url).content.decode()
+    assert NEW_TITLE not in content
+    assert Post.objects.using(replica).get(pk=post.pk).title in content
+
+
+def test_write_makes_client_read_from_primary(client, post, replica):
+    response = client.post(
+        reverse('blog:follow', args=(post.author.username,))
+    )
+    assert PRIMARY_COOKIE in response.cookies
+    url = reverse('blog:post_detail', args=(post.pk,))
+    assert NEW_TITLE in client.get(url).content.decode()
+
+
+def test_authenticated_get_reads_from_primary(
+    user_client, post, replica
+):
+    url = reverse('blog:post_detail', args=(post.pk,))
+    assert NEW_TITLE in user_client.get(url).content.decode()
+
+
+def test_views_without_opt_in_read_from_primary(client, post, replica):
+    response = client.get(reverse('blog:search'), {'q': 'Свежий'})
+    assert NEW_TITLE in response.content.decode()
@@ -0,0 +1,29 @@
+import pytest
+from django.core import checks
+
+from blog.models import Post
+from blog.search import search_posts
+
+pytestmark = pytest.mark.django_db
+
+
+def found(query):
+    return list(search_posts(Post.objects.all(), query))
+
+
+def test_search_triggers_installed():
+    errors = checks.run_checks(
+        tags=[checks.Tags.database], databases=['default']
+    )
+    assert not [error for error in errors if error.id == 'blog.E001']
+
+
+def test_index_follows_post_changes(post):
+    assert found('собак') != []
+    post.title = 'Кошки'
+    post.text = 'Текст про котов'
+    post.save()
+    assert found('котов') == [post]
+    assert post not in found('собак')
+    post.delete()
+    assert found('котов') == []
@@ -0,0 +1,30 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+from blogicum.sqlite3.base import DatabaseWrapper
+
+pytestmark = pytest.mark.django_db
+
+
+def pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+def test_pragmas_are_applied(settings):
+    pragmas = settings.DATABASES['default']['OPTIONS']['pragmas']
+    assert pragma('cache_size') == pragmas['cache_size']
+    assert pragma('busy_timeout') == pragmas['busy_timeout']
+    assert pragma('temp_store') == 2
+    assert pragma('synchronous') == 1
+
+
+def test_invalid_pragma_is_rejected():
+    wrapper = DatabaseWrapper({
+        **connection.settings_dict,
+        'OPTIONS': {'pragmas': {'journal_mode': 'WAL; DROP TABLE x'}},
+    })
+    with pytest.raises(ImproperlyConfigured):
+        wrapper.get_connection_params()
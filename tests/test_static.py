@@ -0,0 +1,54 @@
+import gzip
+
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+
+from blog.media import hashed_static_names
+
+CSS = b'body { background: url("dog.svg"); }\n' * 20
+
+
+@pytest.fixture
+def collected(settings, tmp_path):
+    source = tmp_path / 'static'
+    source.mkdir()
+    (source / 'site.css').write_bytes(CSS)
+    (source / 'dog.svg').write_bytes(b'<svg/>')
+    settings.STATICFILES_DIRS = [source]
+    settings.STATICFILES_FINDERS = [
+        'django.contrib.staticfiles.finders.FileSystemFinder'
+    ]
+    settings.STATIC_ROOT = tmp_path / 'static_root'
+    settings.STATICFILES_STORAGE = (
+        'blogicum.storage.CompressedManifestStaticFilesStorage'
+    )
+    call_command('collectstatic', interactive=False, verbosity=0)
+    hashed_static_names.cache_clear()
+    yield settings.STATIC_ROOT
+    hashed_static_names.cache_clear()
+
+
+def test_collectstatic_writes_compressed_copies(collected):
+    name = staticfiles_storage.stored_name('site.css')
+    content = (collected / name).read_bytes()
+    assert b'dog.' in content and b'dog.svg' not in content
+    compressed = (collected / f'{name}.gz').read_bytes()
+    assert gzip.decompress(compressed) == content
+    # Copies that wouldn't be smaller are skipped.
+    svg = staticfiles_storage.stored_name('dog.svg')
+    assert not (collected / f'{svg}.gz').exists()
+
+
+def test_static_view_sends_precompressed_copy(client, collected):
+    url = staticfiles_storage.url('site.css')
+    response = client.get(url, HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+    assert response.status_code == 200
+    assert response['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response['Vary']
+    assert 'immutable' in response['Cache-Control']
+    content = gzip.decompress(b''.join(response.streaming_content))
+    assert content == (collected / url.split('/static/')[1]).read_bytes()
+    response = client.get('/static/site.css')
+    assert 'Content-Encoding' not in response
+    assert 'immutable' not in response['Cache-Control']
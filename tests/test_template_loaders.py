@@ -0,0 +1,50 @@
+import pytest
+from django.template import Context, Engine
+from django.template.loader_tags import IncludeNode
+
+from blogicum.template_loaders import InlinedIncludeNode
+
+TEMPLATES = {
+    'page.html': (
+        '{% for item in items %}'
+        '{% include "item.html" %}[{{ label|default:"-" }}]'
+        '{% endfor %}'
+        '{% include "blocks.html" %}'
+    ),
+    'item.html': (
+        '{% cycle "odd" "even" %} '
+        '{% firstof item as label %}{{ label }}'
+        '{% include "nested.html" %}'
+    ),
+    'nested.html': '{% with inner=item %}<{{ inner }}>{% endwith %}',
+    'blocks.html': '{% block title %}title{% endblock %}',
+}
+
+
+def engine(loader):
+    return Engine(loaders=[(
+        loader, [('django.template.loaders.locmem.Loader', TEMPLATES)]
+    )])
+
+
+@pytest.fixture
+def inlining():
+    return engine('blogicum.template_loaders.Loader')
+
+
+def test_renders_like_cached_loader(inlining):
+    stock = engine('django.template.loaders.cached.Loader')
+    context = {'items': ['a', 'b', 'c']}
+    expected = stock.get_template('page.html').render(Context(context))
+    for _ in range(2):
+        assert (
+            inlining.get_template('page.html').render(Context(context))
+            == expected
+        )
+
+
+def test_static_includes_are_inlined(inlining):
+    nodelist = inlining.get_template('page.html').nodelist
+    assert len(nodelist.get_nodes_by_type(InlinedIncludeNode)) == 2
+    # Templates with blocks are still included at render time.
+    assert len(nodelist.get_nodes_by_type(IncludeNode)) == 1
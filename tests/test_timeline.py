@@ -0,0 +1,28 @@
+import pytest
+from django.urls import reverse
+
+from blog.models import Category, Follow, Post
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize('fanout_limit', (1000, 0), ids=('pushed', 'pulled'))
+def test_hidden_posts_are_not_counted(
+    settings, another_user_client, another_user, user, posts, fanout_limit
+):
+    settings.TIMELINE_FANOUT_LIMIT = fanout_limit
+    hidden = Category.objects.create(
+        title='Скрытая', description='', slug='hidden', is_published=False
+    )
+    Follow.objects.create(user=another_user, author=user)
+    Post.objects.filter(pk__in=[post.pk for post in posts[:3]]).update(
+        category=hidden
+    )
+    Post.objects.filter(pk=posts[3].pk).update(is_published=False)
+    response = another_user_client.get(reverse('blog:feed'))
+    page = response.context['page_obj']
+    assert page.paginator.count == len(posts) - 4
+    assert len(page) == settings.POST_PAGINATION
+    assert {post.pk for post in page}.isdisjoint(
+        post.pk for post in posts[:4]
+    )